@@ -4,17 +4,80 @@ This uses Azure Functions Python v2 programming model which supports Python 3.11
 """
 
 import azure.functions as func
+import asyncio
 import logging
 import os
+import time
+from collections import deque
+from typing import Optional
 from datetime import datetime, timezone
 from azure.cosmos import CosmosClient, PartitionKey, exceptions
 from azure.identity import DefaultAzureCredential
 import aiohttp
+import orjson
+
+from top_movers_ranking import select_top_movers
 
 app = func.FunctionApp()
 
 logger = logging.getLogger(__name__)
 
+# Shared HTTP session reused across timer invocations (keeps TLS connections warm)
+_SESSION: Optional[aiohttp.ClientSession] = None
+_SESSION_LOCK = asyncio.Lock()
+
+# Alpha Vantage limits: bound in-flight requests and cap requests per minute
+_AV_SEMAPHORE = asyncio.Semaphore(int(os.environ.get("AV_MAX_CONCURRENCY", "4")))
+_AV_MAX_REQUESTS_PER_MINUTE = int(os.environ.get("AV_MAX_REQUESTS_PER_MINUTE", "5"))
+
+
+class RequestRateLimiter:
+    """Sliding-window limiter allowing at most max_requests per period seconds."""
+    
+    def __init__(self, max_requests: int, period: float):
+        self.max_requests = max_requests
+        self.period = period
+        self._sent = deque()
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self) -> None:
+        """Wait until another request may be sent within the window."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                while self._sent and now - self._sent[0] >= self.period:
+                    self._sent.popleft()
+                if len(self._sent) < self.max_requests:
+                    self._sent.append(now)
+                    return
+                await asyncio.sleep(self.period - (now - self._sent[0]))
+
+
+_AV_RATE_LIMITER = RequestRateLimiter(_AV_MAX_REQUESTS_PER_MINUTE, 60)
+
+# Shared Cosmos DB client reused across timer invocations
+_COSMOS_CLIENT: Optional[CosmosClient] = None
+_TOP_MOVERS_CONTAINER = None
+
+
+async def get_http_session() -> aiohttp.ClientSession:
+    """Get or create the module-level aiohttp session.
+    
+    The session lives for the lifetime of the worker process so repeated
+    invocations reuse pooled keep-alive connections to Alpha Vantage. It is
+    not closed explicitly: it belongs to the host's event loop, and process
+    teardown releases its sockets.
+    """
+    global _SESSION
+    
+    async with _SESSION_LOCK:
+        if _SESSION is None or _SESSION.closed:
+            connector = aiohttp.TCPConnector(limit=16, limit_per_host=4, ttl_dns_cache=300)
+            _SESSION = aiohttp.ClientSession(connector=connector)
+            logger.info("Created shared aiohttp session")
+    
+    return _SESSION
+
 
 async def fetch_top_movers_from_api():
     """Fetch top movers data from Alpha Vantage API."""
@@ -23,29 +86,53 @@ async def fetch_top_movers_from_api():
     
     logger.info(f"Fetching top movers from Alpha Vantage API")
     
-    async with aiohttp.ClientSession() as session:
+    session = await get_http_session()
+    
+    async with _AV_SEMAPHORE:
+        await _AV_RATE_LIMITER.acquire()
         async with session.get(url) as response:
             if response.status != 200:
                 logger.error(f"API request failed with status {response.status}")
                 raise Exception(f"API request failed: {response.status}")
             
-            data = await response.json()
-            
-            if "Error Message" in data:
-                logger.error(f"API error: {data['Error Message']}")
-                raise Exception(f"API error: {data['Error Message']}")
-            
-            if "Note" in data:
-                logger.warning(f"API note: {data['Note']}")
-            
-            logger.info("Successfully fetched top movers data")
-            return data
+            data = orjson.loads(await response.read())
+    
+    if "Error Message" in data:
+        logger.error(f"API error: {data['Error Message']}")
+        raise Exception(f"API error: {data['Error Message']}")
+    
+    if "Note" in data:
+        logger.warning(f"API note: {data['Note']}")
+    
+    logger.info("Successfully fetched top movers data")
+    return data
 
 
-def save_to_cosmos(data: dict):
-    """Save top movers data to Cosmos DB using Managed Identity."""
+def get_latest_last_updated(container, date_str: str) -> Optional[str]:
+    """Get the upstream last_updated value of the stored document for a date.
+    
+    Each date partition holds a single "latest" document, so this is a point read.
+    """
+    try:
+        document = container.read_item(item="latest", partition_key=date_str)
+    except exceptions.CosmosResourceNotFoundError:
+        return None
+    return document.get("metadata", {}).get("last_updated")
+
+
+def get_cosmos_client() -> CosmosClient:
+    """Get or create the module-level Cosmos DB client.
+    
+    The client is thread-safe and kept for the lifetime of the worker process,
+    so timer invocations after the first skip the TLS handshake and account
+    metadata discovery done when the client is constructed.
+    """
+    global _COSMOS_CLIENT
+    
+    if _COSMOS_CLIENT is not None:
+        return _COSMOS_CLIENT
+    
     endpoint = os.environ.get("COSMOS_ENDPOINT")
-    database_name = os.environ.get("COSMOS_DATABASE_NAME")
     
     logger.info(f"Connecting to Cosmos DB: {endpoint}")
     
@@ -80,51 +167,101 @@ def save_to_cosmos(data: dict):
     if is_local:
         logger.warning("SSL verification disabled for localhost")
     
-    client = CosmosClient(
+    _COSMOS_CLIENT = CosmosClient(
         url=endpoint,
         credential=credential,
         connection_verify=connection_verify
     )
     
-    database = client.get_database_client(database_name)
+    return _COSMOS_CLIENT
+
+
+def get_top_movers_container():
+    """Get the top_movers container proxy.
+    
+    Building the proxy is client-side only; no request is sent to Cosmos DB.
+    """
+    global _TOP_MOVERS_CONTAINER
+    
+    if _TOP_MOVERS_CONTAINER is None:
+        database = get_cosmos_client().get_database_client(os.environ.get("COSMOS_DATABASE_NAME"))
+        _TOP_MOVERS_CONTAINER = database.get_container_client("top_movers")
+    
+    return _TOP_MOVERS_CONTAINER
+
+
+def create_top_movers_container():
+    """Create the top_movers container when it doesn't exist yet.
+    
+    Only used as a fallback when a write hits a fresh database; normally the
+    container is provisioned once by init_cosmos.py.
+    """
+    global _TOP_MOVERS_CONTAINER
+    
+    database = get_cosmos_client().get_database_client(os.environ.get("COSMOS_DATABASE_NAME"))
     
     try:
-        container = database.create_container_if_not_exists(
+        _TOP_MOVERS_CONTAINER = database.create_container_if_not_exists(
             id="top_movers",
             partition_key=PartitionKey(path="/date"),
             offer_throughput=400
         )
-        logger.info("Container 'top_movers' ready")
+        logger.info("Container 'top_movers' created")
     except exceptions.CosmosHttpResponseError as e:
         logger.error(f"Error creating container: {e}")
         raise
     
-    now = datetime.now(timezone.utc)
-    timestamp = now.isoformat()
-    date_str = now.strftime("%Y-%m-%d")
+    return _TOP_MOVERS_CONTAINER
+
+
+def save_to_cosmos(data: dict):
+    """Save top movers data to Cosmos DB using Managed Identity."""
+    container = get_top_movers_container()
+    
+    # ISO timestamp starts with YYYY-MM-DD, so the partition date is a prefix slice
+    timestamp = datetime.now(timezone.utc).isoformat()
+    date_str = timestamp[:10]
+    
+    # Skip the write when Alpha Vantage hasn't published new data (e.g. market closed)
+    last_updated = data.get("last_updated", "")
+    if last_updated:
+        try:
+            if get_latest_last_updated(container, date_str) == last_updated:
+                logger.info(f"Top movers unchanged since {last_updated}, skipping save")
+                return
+        except exceptions.CosmosHttpResponseError as e:
+            logger.warning(f"Could not read latest top movers document: {e}")
+    
+    gainers = data.get("top_gainers", [])
+    losers = data.get("top_losers", [])
+    active = data.get("most_actively_traded", [])
     
     document = {
-        "id": f"top-movers-{timestamp}",
+        "id": "latest",
         "date": date_str,
         "timestamp": timestamp,
         "data": {
-            "top_gainers": data.get("top_gainers", [])[:20],
-            "top_losers": data.get("top_losers", [])[:20],
-            "most_actively_traded": data.get("most_actively_traded", [])[:20]
+            "top_gainers": select_top_movers(gainers, "change_percentage"),
+            "top_losers": select_top_movers(losers, "change_percentage", descending=False),
+            "most_actively_traded": select_top_movers(active, "volume")
         },
         "metadata": {
-            "last_updated": data.get("last_updated", ""),
+            "last_updated": last_updated,
             "record_count": {
-                "gainers": len(data.get("top_gainers", [])),
-                "losers": len(data.get("top_losers", [])),
-                "active": len(data.get("most_actively_traded", []))
+                "gainers": len(gainers),
+                "losers": len(losers),
+                "active": len(active)
             }
         }
     }
     
     try:
-        container.create_item(body=document)
-        logger.info(f"Successfully saved top movers data: {document['id']}")
+        try:
+            container.upsert_item(body=document)
+        except exceptions.CosmosResourceNotFoundError:
+            logger.warning("Container 'top_movers' not found, creating it")
+            create_top_movers_container().upsert_item(body=document)
+        logger.info(f"Successfully saved top movers data for {date_str}")
     except exceptions.CosmosHttpResponseError as e:
         logger.error(f"Error saving to Cosmos DB: {e}")
         raise
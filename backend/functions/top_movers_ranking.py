@@ -0,0 +1,39 @@
+"""Ranking rules for the top movers lists.
+
+Shared by the timer function (function_app.py) and the manual
+populate_top_movers.py script. It lives in the functions folder because
+the Functions app is deployed from this folder alone; the script adds the
+folder to sys.path instead of keeping its own copy.
+"""
+
+import numpy as np
+
+# Number of rows kept per movers list
+TOP_MOVERS_LIMIT = 20
+
+
+def _mover_value(item: dict, field: str) -> float:
+    """Parse a numeric Alpha Vantage field such as "12.5%" or "1234567"."""
+    try:
+        return float(str(item.get(field, "")).rstrip("%"))
+    except ValueError:
+        return float("nan")
+
+
+def select_top_movers(items: list, field: str, descending: bool = True, limit: int = TOP_MOVERS_LIMIT) -> list:
+    """Select the top rows of a movers list ranked by a numeric field.
+    
+    Lists that already fit within the limit are returned in upstream order.
+    Longer lists use numpy.argpartition for an O(n) top-k pass and only sort
+    the selected rows; unparseable values rank last.
+    """
+    if len(items) <= limit:
+        return items
+    
+    values = np.fromiter((_mover_value(item, field) for item in items), dtype=np.float64, count=len(items))
+    if descending:
+        values = -values
+    
+    top = np.argpartition(values, limit)[:limit]
+    top = top[np.argsort(values[top], kind="stable")]
+    return [items[i] for i in top]
@@ -2,7 +2,7 @@
 Cosmos DB 초기화 스크립트
 - top_movers 컬렉션 생성
 """
-from azure.cosmos import exceptions
+from azure.cosmos import PartitionKey, exceptions
 from src.core.database import get_database
 
 def init_top_movers_container():
@@ -24,7 +24,7 @@ def init_top_movers_container():
         print("📦 'top_movers' 컨테이너를 생성합니다...")
         container = database.create_container(
             id="top_movers",
-            partition_key={"paths": ["/id"], "kind": "Hash"}
+            partition_key=PartitionKey(path="/date")
         )
         print("✅ 'top_movers' 컨테이너가 성공적으로 생성되었습니다!")
         
@@ -0,0 +1,86 @@
+"""One-shot migration of user documents to the /id-partitioned container.
+
+User documents used to live in a container partitioned by /email with uuid
+ids. The app now reads a container partitioned by /id, where the id is the
+SHA-256 hash of the email. A partition key can't be changed in place, so
+this copies every document from COSMOS_LEGACY_CONTAINER_NAME to
+COSMOS_CONTAINER_NAME under its new id (keeping the old id as legacy_id).
+
+Documents already copied (by an earlier run, or re-keyed by the app on a
+user's first request) are skipped, so the script can be re-run safely.
+See README_DEPLOY.md for the deployment order.
+
+Usage (from backend/):
+    python migrate_users.py [--dry-run]
+"""
+
+import argparse
+import sys
+
+from azure.cosmos import PartitionKey, exceptions
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from src.core.config import settings
+from src.core.database import get_database
+from src.core.user_keys import rekey_user_document
+
+
+def migrate_users(dry_run: bool = False) -> dict:
+    """Copy every legacy user document under its email-hash id.
+    
+    Args:
+        dry_run: Only count the documents that would be copied
+        
+    Returns:
+        Counts of copied, skipped (already present) and failed documents
+    """
+    database = get_database()
+    legacy_container = database.get_container_client(settings.COSMOS_LEGACY_CONTAINER_NAME)
+    container = database.create_container_if_not_exists(
+        id=settings.COSMOS_CONTAINER_NAME,
+        partition_key=PartitionKey(path="/id")
+    )
+    
+    counts = {"copied": 0, "skipped": 0, "failed": 0}
+    for document in legacy_container.read_all_items():
+        rekeyed = rekey_user_document(document)
+        
+        if dry_run:
+            counts["copied"] += 1
+            continue
+        
+        try:
+            container.create_item(body=rekeyed)
+            counts["copied"] += 1
+        except exceptions.CosmosResourceExistsError:
+            counts["skipped"] += 1
+        except exceptions.CosmosHttpResponseError as e:
+            counts["failed"] += 1
+            print(f"Failed to copy user {document['id']}: {e}")
+    
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dry-run", action="store_true", help="count documents without copying")
+    args = parser.parse_args()
+    
+    if not settings.COSMOS_LEGACY_CONTAINER_NAME:
+        print("COSMOS_LEGACY_CONTAINER_NAME is empty; nothing to migrate")
+        return 1
+    
+    print(
+        f"Migrating users: {settings.COSMOS_LEGACY_CONTAINER_NAME} (/email) -> "
+        f"{settings.COSMOS_CONTAINER_NAME} (/id){' [dry run]' if args.dry_run else ''}"
+    )
+    counts = migrate_users(dry_run=args.dry_run)
+    print(f"copied={counts['copied']} skipped={counts['skipped']} failed={counts['failed']}")
+    
+    return 1 if counts["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,24 +12,31 @@ from pathlib import Path
 backend_src = Path(__file__).parent.parent / "src"
 sys.path.insert(0, str(backend_src))
 
+# Ranking rules are shared with the Functions app
+sys.path.insert(0, str(Path(__file__).parent / "functions"))
+
 import asyncio
 from datetime import datetime, timezone
-from azure.cosmos import CosmosClient, PartitionKey, exceptions
-import requests
+from azure.cosmos import CosmosClient, exceptions
+import aiohttp
+import orjson
+
+from top_movers_ranking import select_top_movers
 
 # Load environment variables
 from dotenv import load_dotenv
 load_dotenv()
 
-def fetch_top_movers():
-    """Fetch from Alpha Vantage."""
+async def fetch_top_movers():
+    """Fetch from Alpha Vantage (gzip-compressed, decoded with orjson)."""
     api_key = os.getenv("ALPHA_VANTAGE_API_KEY")
     url = f"https://www.alphavantage.co/query?function=TOP_GAINERS_LOSERS&apikey={api_key}"
     
     print(f"Fetching data from Alpha Vantage...")
-    response = requests.get(url, timeout=10)
-    response.raise_for_status()
-    data = response.json()
+    async with aiohttp.ClientSession(headers={"Accept-Encoding": "gzip"}) as session:
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
+            response.raise_for_status()
+            data = await response.json(loads=orjson.loads)
     
     print(f"✓ Fetched {len(data.get('top_gainers', []))} gainers")
     print(f"✓ Fetched {len(data.get('top_losers', []))} losers")
@@ -37,11 +44,18 @@ def fetch_top_movers():
     
     return data
 
-def save_to_cosmos(data):
-    """Save to Cosmos DB."""
+# Shared Cosmos DB client (created once, reused by every save)
+_cosmos_client = None
+
+def get_cosmos_client():
+    """Get or create the shared Cosmos DB client."""
+    global _cosmos_client
+    
+    if _cosmos_client is not None:
+        return _cosmos_client
+    
     endpoint = os.getenv("COSMOS_ENDPOINT")
     key = os.getenv("COSMOS_KEY")
-    database_name = os.getenv("COSMOS_DATABASE_NAME")
     
     print(f"\nConnecting to Cosmos DB: {endpoint}")
     
@@ -51,51 +65,55 @@ def save_to_cosmos(data):
         connection_verify = False
         print("Using local Cosmos DB emulator")
     
-    client = CosmosClient(url=endpoint, credential=key, connection_verify=connection_verify)
-    database = client.get_database_client(database_name)
+    _cosmos_client = CosmosClient(url=endpoint, credential=key, connection_verify=connection_verify)
+    return _cosmos_client
+
+def save_to_cosmos(data):
+    """Save to Cosmos DB."""
+    database_name = os.getenv("COSMOS_DATABASE_NAME")
+    
+    database = get_cosmos_client().get_database_client(database_name)
     
-    # Create container if needed
-    try:
-        container = database.create_container_if_not_exists(
-            id="top_movers",
-            partition_key=PartitionKey(path="/date"),
-            offer_throughput=400
-        )
-        print("✓ Container 'top_movers' ready")
-    except exceptions.CosmosHttpResponseError as e:
-        print(f"✗ Error creating container: {e}")
-        raise
+    # Container is provisioned by init_cosmos.py; this is a client-side lookup only
+    container = database.get_container_client("top_movers")
     
     # Prepare document
-    now = datetime.now(timezone.utc)
-    timestamp = now.isoformat()
-    date_str = now.strftime("%Y-%m-%d")
+    # ISO timestamp starts with YYYY-MM-DD, so the partition date is a prefix slice
+    timestamp = datetime.now(timezone.utc).isoformat()
+    date_str = timestamp[:10]
+    
+    gainers = data.get("top_gainers", [])
+    losers = data.get("top_losers", [])
+    active = data.get("most_actively_traded", [])
     
     document = {
-        "id": f"top-movers-{timestamp}",
+        "id": "latest",
         "date": date_str,
         "timestamp": timestamp,
         "data": {
-            "top_gainers": data.get("top_gainers", [])[:20],
-            "top_losers": data.get("top_losers", [])[:20],
-            "most_actively_traded": data.get("most_actively_traded", [])[:20]
+            "top_gainers": select_top_movers(gainers, "change_percentage"),
+            "top_losers": select_top_movers(losers, "change_percentage", descending=False),
+            "most_actively_traded": select_top_movers(active, "volume")
         },
         "metadata": {
             "last_updated": data.get("last_updated", ""),
             "record_count": {
-                "gainers": len(data.get("top_gainers", [])),
-                "losers": len(data.get("top_losers", [])),
-                "active": len(data.get("most_actively_traded", []))
+                "gainers": len(gainers),
+                "losers": len(losers),
+                "active": len(active)
             }
         }
     }
     
     # Save
     try:
-        container.create_item(body=document)
+        container.upsert_item(body=document)
         print(f"✓ Saved document: {document['id']}")
         print(f"  Date: {date_str}")
         print(f"  Timestamp: {timestamp}")
+    except exceptions.CosmosResourceNotFoundError:
+        print("✗ Container 'top_movers' not found. Run init_cosmos.py first.")
+        raise
     except exceptions.CosmosHttpResponseError as e:
         print(f"✗ Error saving: {e}")
         raise
@@ -107,7 +125,7 @@ if __name__ == "__main__":
     
     try:
         # Fetch from API
-        data = fetch_top_movers()
+        data = asyncio.run(fetch_top_movers())
         
         # Save to Cosmos DB
         save_to_cosmos(data)
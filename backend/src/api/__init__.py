@@ -9,11 +9,14 @@ from . import health, auth, watchlist, stocks, portfolios
 
 api_router = APIRouter()
 
-api_router.include_router(health.router, prefix="/health", tags=["Health"])
-api_router.include_router(auth.router, prefix="/auth", tags=["Authentication"])
-api_router.include_router(watchlist.router, prefix="/watchlist", tags=["Watchlist"])
-api_router.include_router(stocks.router, prefix="/stocks", tags=["Stocks"])
-api_router.include_router(portfolios.router, prefix="/portfolios", tags=["Portfolios"])
+# (module, prefix, tag) for every router mounted under /api/v1
+_ROUTES = [
+    (health, "/health", "Health"),
+    (auth, "/auth", "Authentication"),
+    (watchlist, "/watchlist", "Watchlist"),
+    (stocks, "/stocks", "Stocks"),
+    (portfolios, "/portfolios", "Portfolios"),
+]
 
-# Future routers will be added here:
-# api_router.include_router(portfolios.router, prefix="/portfolios", tags=["Portfolios"])
+for module, prefix, tag in _ROUTES:
+    api_router.include_router(module.router, prefix=prefix, tags=[tag])
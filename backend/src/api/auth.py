@@ -3,15 +3,28 @@
 Handles user registration, login, and profile management with Cosmos DB.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import ORJSONResponse
 from azure.cosmos import exceptions
-from datetime import datetime, timedelta
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+import asyncio
+import hashlib
+import hmac
 import logging
+import time
 
-from src.core.database import get_db
-from src.core.security import hash_password, verify_password, create_access_token
+from src.core.database import get_async_db
+from src.core.security import (
+    ahash_password,
+    averify_password,
+    create_access_token,
+    ACCESS_TOKEN_TTL,
+    ACCESS_TOKEN_TTL_SECONDS,
+)
 from src.core.config import settings
-from src.core.middleware import get_current_user_id
+from src.core.middleware import get_client_ip, get_current_user_id, SlidingWindowRateLimiter
+from src.core.user_keys import email_key, migrate_legacy_user
 from src.models.user import UserDocument, PortfolioItem
 from src.schemas.auth import (
     UserRegisterRequest,
@@ -26,11 +39,161 @@ from src.schemas.auth import (
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# Account fields used by auth; the id is also the partition key
+ACCOUNT_QUERY = (
+    "SELECT c.id, c.email, c.password_hash, c.created_at, c.last_login_at, c.is_active "
+    "FROM c WHERE c.id = @id"
+)
+
+# Caps login attempts before any password hashing is done. The per-account
+# cap is much higher than the per-client one, so a single client can't lock
+# someone else out; it only catches guessing spread over many addresses.
+login_limiter = SlidingWindowRateLimiter(settings.LOGIN_RATE_LIMIT_PER_MINUTE)
+account_login_limiter = SlidingWindowRateLimiter(settings.LOGIN_ACCOUNT_RATE_LIMIT_PER_MINUTE)
+
+# Serialized /me responses: user id -> (cached_until, profile dict)
+_PROFILE_CACHE_TTL_SECONDS = 30
+_PROFILE_CACHE_MAX_SIZE = 50_000
+_profile_cache: Dict[str, Tuple[float, dict]] = {}
+
+# Write-behind buffer of last_login_at updates: user id -> ISO timestamp
+LOGIN_FLUSH_INTERVAL_SECONDS = 5
+_pending_logins: Dict[str, str] = {}
+
+# Recently verified logins: user id -> (cached_until, credential digest)
+_LOGIN_CACHE_TTL_SECONDS = 30
+_LOGIN_CACHE_MAX_SIZE = 10_000
+_verified_logins: Dict[str, Tuple[float, bytes]] = {}
+
+
+async def _verify_login_password(user_id: str, password: str, password_hash: str) -> bool:
+    """Verify a login password, skipping the hash check for repeated logins.
+    
+    A successful check is remembered for a few seconds as a digest of the
+    password and stored hash, so retries with the same credentials don't pay
+    for another Argon2/bcrypt run. Changing the stored hash invalidates it.
+    
+    Args:
+        user_id: User document id
+        password: Plain text password from the request
+        password_hash: Stored password hash
+        
+    Returns:
+        True if the password matches, False otherwise
+    """
+    digest = hashlib.sha256(f"{password_hash}:{password}".encode()).digest()
+    now = time.monotonic()
+    
+    cached = _verified_logins.get(user_id)
+    if cached is not None and now < cached[0] and hmac.compare_digest(cached[1], digest):
+        return True
+    
+    if not await averify_password(password, password_hash):
+        return False
+    
+    if len(_verified_logins) >= _LOGIN_CACHE_MAX_SIZE:
+        _verified_logins.clear()
+    _verified_logins[user_id] = (now + _LOGIN_CACHE_TTL_SECONDS, digest)
+    
+    return True
+
+
+async def _read_account(container, user_id: str) -> Optional[dict]:
+    """Read only the account fields auth needs from a user document.
+    
+    The projection skips the embedded watchlist and portfolios, which can
+    hold hundreds of entries and are never used by the auth endpoints.
+    
+    Args:
+        container: Async Cosmos DB container
+        user_id: User document id (also the partition key)
+        
+    Returns:
+        Dict with the account fields, or None if the user doesn't exist
+    """
+    items = container.query_items(
+        query=ACCOUNT_QUERY,
+        parameters=[{"name": "@id", "value": user_id}],
+        partition_key=user_id,
+        max_item_count=1
+    )
+    async for item in items:
+        return item
+    return None
+
+
+def _cache_profile(user_id: str, content: dict) -> None:
+    """Store a serialized profile for /me.
+    
+    Args:
+        user_id: User document id
+        content: JSON-ready UserProfileResponse dict
+    """
+    if len(_profile_cache) >= _PROFILE_CACHE_MAX_SIZE:
+        _profile_cache.clear()
+    _profile_cache[user_id] = (time.monotonic() + _PROFILE_CACHE_TTL_SECONDS, content)
+
+
+async def _record_last_login(container, user_id: str, timestamp: str) -> None:
+    """Patch the user's last_login_at field without rewriting the document.
+    
+    Failures are logged and ignored because the timestamp is informational only.
+    
+    Args:
+        container: Async Cosmos DB container
+        user_id: User document id (also the partition key)
+        timestamp: ISO formatted login timestamp
+    """
+    try:
+        await container.patch_item(
+            item=user_id,
+            partition_key=user_id,
+            patch_operations=[{"op": "set", "path": "/last_login_at", "value": timestamp}]
+        )
+    except exceptions.CosmosHttpResponseError as e:
+        logger.error(f"Error updating last login for user {user_id}: {e}")
+
+
+async def flush_pending_logins(container) -> None:
+    """Write buffered last_login_at timestamps to Cosmos DB.
+    
+    Repeated logins by the same user within a flush interval collapse into a
+    single patch; patches for different users are sent concurrently.
+    
+    Args:
+        container: Async Cosmos DB container
+    """
+    global _pending_logins
+    
+    if not _pending_logins:
+        return
+    
+    # Swap the buffer before awaiting so logins during the flush go to the next batch
+    pending, _pending_logins = _pending_logins, {}
+    await asyncio.gather(*(
+        _record_last_login(container, user_id, timestamp)
+        for user_id, timestamp in pending.items()
+    ))
+
+
+async def run_login_flusher(container) -> None:
+    """Flush buffered login timestamps every few seconds until cancelled.
+    
+    Args:
+        container: Async Cosmos DB container
+    """
+    while True:
+        await asyncio.sleep(LOGIN_FLUSH_INTERVAL_SECONDS)
+        try:
+            await flush_pending_logins(container)
+        except Exception as e:
+            logger.error(f"Error flushing last login timestamps: {e}")
+
 
 @router.post("/register", response_model=UserRegisterResponse, status_code=status.HTTP_201_CREATED)
 async def register_user(
     request: UserRegisterRequest,
-    container = Depends(get_db)
+    container = Depends(get_async_db)
 ):
     """Register a new user account.
     
@@ -39,7 +202,7 @@ async def register_user(
     
     Args:
         request: User registration data (email, password)
-        container: Cosmos DB container
+        container: Async Cosmos DB container
         
     Returns:
         User profile, JWT token, and list of created portfolios
@@ -48,30 +211,14 @@ async def register_user(
         HTTPException 400: If email already exists
         HTTPException 500: If user creation fails
     """
-    # Check if email already exists
-    query = "SELECT * FROM c WHERE c.email = @email"
-    parameters = [{"name": "@email", "value": request.email}]
-    
     try:
-        existing_users = list(container.query_items(
-            query=query,
-            parameters=parameters,
-            enable_cross_partition_query=True
-        ))
-        
-        if existing_users:
+        # An account still in the pre-migration container is a duplicate too
+        if await migrate_legacy_user(container, request.email):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already registered"
             )
-    except exceptions.CosmosHttpResponseError as e:
-        logger.error(f"Error checking existing user: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Database query failed"
-        )
-    
-    try:
+        
         # Create user document with 3 predefined portfolios
         portfolio_names = settings.PORTFOLIO_NAMES  # ["장기투자", "단타", "정찰병"]
         portfolios = [
@@ -80,27 +227,28 @@ async def register_user(
         ]
         
         user_doc = UserDocument(
+            id=email_key(request.email),
             email=request.email,
-            password_hash=hash_password(request.password),
+            password_hash=await ahash_password(request.password),
             is_active=True,
             last_login_at=datetime.utcnow(),
             portfolios=portfolios
         )
         
         # Insert document into Cosmos DB
-        created_item = container.create_item(body=user_doc.to_cosmos_dict())
+        created_item = await container.create_item(body=user_doc.to_cosmos_dict())
         logger.info(f"User registered: {request.email}")
         
         # Generate JWT token (use document id)
         access_token = create_access_token(
             data={"sub": created_item["id"]},
-            expires_delta=timedelta(hours=settings.ACCESS_TOKEN_EXPIRE_HOURS)
+            expires_delta=ACCESS_TOKEN_TTL
         )
         
         token_response = TokenResponse(
             access_token=access_token,
             token_type="bearer",
-            expires_in=settings.ACCESS_TOKEN_EXPIRE_HOURS * 3600
+            expires_in=ACCESS_TOKEN_TTL_SECONDS
         )
         
         # Convert to response model
@@ -112,12 +260,24 @@ async def register_user(
             is_active=created_item["is_active"]
         )
         
-        return UserRegisterResponse(
+        # Already validated above; serialize once instead of letting FastAPI
+        # re-validate against response_model
+        response = UserRegisterResponse(
             user=user_response,
             token=token_response,
             portfolios_created=portfolio_names
         )
+        return ORJSONResponse(
+            content=response.model_dump(mode="json"),
+            status_code=status.HTTP_201_CREATED
+        )
         
+    except exceptions.CosmosResourceExistsError:
+        # Document id is derived from the email, so a conflict means duplicate email
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered"
+        )
     except exceptions.CosmosHttpResponseError as e:
         logger.error(f"Error creating user: {e}")
         raise HTTPException(
@@ -129,7 +289,8 @@ async def register_user(
 @router.post("/login", response_model=UserLoginResponse)
 async def login_user(
     request: UserLoginRequest,
-    container = Depends(get_db)
+    http_request: Request,
+    container = Depends(get_async_db)
 ):
     """Authenticate user and return JWT token.
     
@@ -138,33 +299,33 @@ async def login_user(
     
     Args:
         request: User login credentials (email, password)
-        container: Cosmos DB container
+        http_request: Raw HTTP request (client address for rate limiting)
+        container: Async Cosmos DB container
         
     Returns:
         User profile and JWT token
         
     Raises:
         HTTPException 401: If credentials are invalid or account is inactive
+        HTTPException 429: If too many login attempts were made
     """
-    # Find user by email
-    query = "SELECT * FROM c WHERE c.email = @email"
-    parameters = [{"name": "@email", "value": request.email}]
+    user_key = email_key(request.email)
+    
+    # Reject floods per client and per account before doing any hashing
+    if not login_limiter.hit(get_client_ip(http_request)) or not account_login_limiter.hit(user_key):
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts. Please try again later.",
+            headers={"Retry-After": "60"}
+        )
     
+    # Find user by email (single-partition lookup on the email-derived id)
     try:
-        users = list(container.query_items(
-            query=query,
-            parameters=parameters,
-            enable_cross_partition_query=True
-        ))
-        
-        if not users:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid email or password"
-            )
-        
-        user_data = users[0]
+        user_data = await _read_account(container, user_key)
         
+        # Registered before the move to email-hash ids: re-key, then read again
+        if user_data is None and await migrate_legacy_user(container, request.email):
+            user_data = await _read_account(container, user_key)
     except exceptions.CosmosHttpResponseError as e:
         logger.error(f"Error querying user: {e}")
         raise HTTPException(
@@ -172,8 +333,14 @@ async def login_user(
             detail="Database query failed"
         )
     
+    if user_data is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid email or password"
+        )
+    
     # Verify password
-    if not verify_password(request.password, user_data["password_hash"]):
+    if not await _verify_login_password(user_key, request.password, user_data["password_hash"]):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password"
@@ -186,51 +353,47 @@ async def login_user(
             detail="Account is inactive"
         )
     
-    # Update last login timestamp
+    # Update last login timestamp (buffered, written by the background flusher)
     user_data["last_login_at"] = datetime.utcnow().isoformat()
-    
-    try:
-        updated_user = container.replace_item(
-            item=user_data["id"],
-            body=user_data
-        )
-        logger.info(f"User logged in: {request.email}")
-        
-    except exceptions.CosmosHttpResponseError as e:
-        logger.error(f"Error updating user: {e}")
-        # Non-critical error, continue with login
-        updated_user = user_data
+    _pending_logins[user_data["id"]] = user_data["last_login_at"]
+    logger.info(f"User logged in: {request.email}")
     
     # Generate JWT token
     access_token = create_access_token(
-        data={"sub": updated_user["id"]},
-        expires_delta=timedelta(hours=settings.ACCESS_TOKEN_EXPIRE_HOURS)
+        data={"sub": user_data["id"]},
+        expires_delta=ACCESS_TOKEN_TTL
     )
     
     token_response = TokenResponse(
         access_token=access_token,
         token_type="bearer",
-        expires_in=settings.ACCESS_TOKEN_EXPIRE_HOURS * 3600
+        expires_in=ACCESS_TOKEN_TTL_SECONDS
     )
     
     user_response = UserProfileResponse(
-        id=updated_user["id"],
-        email=updated_user["email"],
-        created_at=updated_user["created_at"],
-        last_login_at=updated_user.get("last_login_at"),
-        is_active=updated_user["is_active"]
+        id=user_data["id"],
+        email=user_data["email"],
+        created_at=user_data["created_at"],
+        last_login_at=user_data.get("last_login_at"),
+        is_active=user_data["is_active"]
     )
     
-    return UserLoginResponse(
+    response = UserLoginResponse(
         user=user_response,
         token=token_response
     )
+    content = response.model_dump(mode="json")
+    
+    # Refresh the cached profile so /me reflects this login before the flush
+    _cache_profile(user_data["id"], content["user"])
+    
+    return ORJSONResponse(content=content)
 
 
 @router.get("/me", response_model=UserProfileResponse)
 async def get_current_user_profile(
     user_id: str = Depends(get_current_user_id),
-    container = Depends(get_db)
+    container = Depends(get_async_db)
 ):
     """Get current authenticated user's profile.
     
@@ -238,7 +401,7 @@ async def get_current_user_profile(
     
     Args:
         user_id: User ID from JWT token (document id)
-        container: Cosmos DB container
+        container: Async Cosmos DB container
         
     Returns:
         User profile information
@@ -246,32 +409,31 @@ async def get_current_user_profile(
     Raises:
         HTTPException 404: If user not found
     """
-    # Query user by document id
-    query = "SELECT * FROM c WHERE c.id = @user_id AND c.is_active = true"
-    parameters = [{"name": "@user_id", "value": user_id}]
+    cached = _profile_cache.get(user_id)
+    if cached is not None and time.monotonic() < cached[0]:
+        return ORJSONResponse(content=cached[1])
     
+    # Lookup by document id (id is also the partition key)
     try:
-        users = list(container.query_items(
-            query=query,
-            parameters=parameters,
-            enable_cross_partition_query=True
-        ))
+        user_data = await _read_account(container, user_id)
         
-        if not users:
+        if user_data is None or not user_data.get("is_active", False):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="User not found"
             )
         
-        user_data = users[0]
-        
-        return UserProfileResponse(
+        profile = UserProfileResponse(
             id=user_data["id"],
             email=user_data["email"],
             created_at=user_data["created_at"],
             last_login_at=user_data.get("last_login_at"),
             is_active=user_data["is_active"]
         )
+        content = profile.model_dump(mode="json")
+        _cache_profile(user_id, content)
+        
+        return ORJSONResponse(content=content)
         
     except exceptions.CosmosHttpResponseError as e:
         logger.error(f"Error querying user: {e}")
@@ -284,7 +446,7 @@ async def get_current_user_profile(
 @router.delete("/me", status_code=status.HTTP_204_NO_CONTENT)
 async def deactivate_account(
     user_id: str = Depends(get_current_user_id),
-    container = Depends(get_db)
+    container = Depends(get_async_db)
 ):
     """Deactivate current user's account (soft delete).
     
@@ -293,39 +455,31 @@ async def deactivate_account(
     
     Args:
         user_id: User ID from JWT token
-        container: Cosmos DB container
+        container: Async Cosmos DB container
         
     Raises:
         HTTPException 404: If user not found
     """
-    # Query user by document id
-    query = "SELECT * FROM c WHERE c.id = @user_id AND c.is_active = true"
-    parameters = [{"name": "@user_id", "value": user_id}]
-    
+    # Single patch on the document id (id is also the partition key); the filter
+    # makes an already deactivated account fail the precondition like a missing one
     try:
-        users = list(container.query_items(
-            query=query,
-            parameters=parameters,
-            enable_cross_partition_query=True
-        ))
-        
-        if not users:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User not found"
-            )
-        
-        user_data = users[0]
-        user_data["is_active"] = False
-        
-        container.replace_item(
-            item=user_data["id"],
-            body=user_data
+        user_data = await container.patch_item(
+            item=user_id,
+            partition_key=user_id,
+            patch_operations=[{"op": "set", "path": "/is_active", "value": False}],
+            filter_predicate="FROM c WHERE c.is_active = true"
         )
         
+        _verified_logins.pop(user_id, None)
+        _profile_cache.pop(user_id, None)
         logger.info(f"User deactivated: {user_data['email']}")
         return None
         
+    except (exceptions.CosmosResourceNotFoundError, exceptions.CosmosAccessConditionFailedError):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
     except exceptions.CosmosHttpResponseError as e:
         logger.error(f"Error deactivating user: {e}")
         raise HTTPException(
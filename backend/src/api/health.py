@@ -4,16 +4,41 @@ Provides endpoints to verify application and database health.
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse
 from datetime import datetime
+from typing import Optional, Tuple
+import time
 from src.core.database import get_db
 
 
 router = APIRouter()
 
+# Last healthy /health response, reused for a few seconds: (checked_at, response)
+HEALTH_CACHE_TTL_SECONDS = 5
+_last_check: Optional[Tuple[float, dict]] = None
+
+# Liveness body never changes, so the response is built once at import
+_LIVENESS_RESPONSE = ORJSONResponse({"status": "ok"})
+
+
+@router.get("/livez")
+async def liveness_check():
+    """Liveness probe that never touches the database.
+    
+    Returns:
+        Static ok status while the process is serving requests
+    """
+    return _LIVENESS_RESPONSE
+
 
 @router.get("")  # "/" 대신 "" 사용
-async def health_check(container = Depends(get_db)):
-    """Check application and database health.
+@router.get("/readyz")
+def health_check(container = Depends(get_db)):
+    """Check application and database health (readiness probe).
+    
+    A healthy result is cached for a few seconds so frequent probes don't
+    hit Cosmos DB on every call. Declared sync so the blocking Cosmos call
+    runs in the threadpool instead of on the event loop.
     
     Returns:
         Health status including timestamp and database connectivity
@@ -21,33 +46,34 @@ async def health_check(container = Depends(get_db)):
     Raises: 
         HTTPException: If database connection fails
     """
+    global _last_check
+    
+    if _last_check is not None and time.monotonic() - _last_check[0] < HEALTH_CACHE_TTL_SECONDS:
+        return _last_check[1]
+    
     try:
-        # Test Cosmos DB connection with a simple query
-        query = "SELECT VALUE COUNT(1) FROM c"
-        result = list(container.query_items(
-            query=query,
-            enable_cross_partition_query=True
-        ))
-        db_status = "connected"
-        user_count = result[0] if result else 0
+        # Test Cosmos DB connection with a container metadata read (no query fan-out)
+        container.read()
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail=f"Database connection failed: {str(e)}"
         )
     
-    return {
+    response = {
         "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat(),
-        "database": db_status,
+        "timestamp": datetime.utcnow(),
+        "database": "connected",
         "database_type": "Azure Cosmos DB NoSQL",
-        "user_count": user_count,
         "version": "2.0.0"
     }
+    _last_check = (time.monotonic(), response)
+    
+    return response
 
 
 @router.get("/db")  # "/health/db" 대신 "/db"
-async def database_health_check(container = Depends(get_db)):
+def database_health_check(container = Depends(get_db)):
     """Detailed database health check.
     
     Returns:
@@ -57,19 +83,15 @@ async def database_health_check(container = Depends(get_db)):
         HTTPException: If database connection fails
     """
     try:
-        # Test Cosmos DB connection
-        query = "SELECT VALUE COUNT(1) FROM c"
-        result = list(container.query_items(
-            query=query,
-            enable_cross_partition_query=True
-        ))
+        # Test Cosmos DB connection with a container metadata read (O(1) RU)
+        properties = container.read()
         
         return {
             "status": "healthy",
             "database": "connected",
             "database_type": "Azure Cosmos DB NoSQL",
-            "user_count": result[0] if result else 0,
-            "timestamp": datetime.utcnow().isoformat()
+            "container": properties.get("id"),
+            "timestamp": datetime.utcnow()
         }
     except Exception as e:
         raise HTTPException(
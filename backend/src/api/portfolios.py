@@ -8,18 +8,23 @@ Provides endpoints for:
 - Enforcing 100-item limit per portfolio
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import ORJSONResponse
 from azure.cosmos import exceptions
+import numpy as np
 from decimal import Decimal
 from datetime import datetime
+import json
 import logging
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
 import uuid
 
-from src.core.database import get_db
+from src.core.database import get_async_db
 from src.core.config import settings
-from src.core.middleware import get_current_user_id
+from src.core.middleware import get_current_user_id, now_utc
+from src.core.pnl import compute_pnl
 from src.models.user import UserDocument, PortfolioItem, HoldingItem
 from src.schemas.portfolios import (
     PortfolioResponse,
@@ -28,20 +33,397 @@ from src.schemas.portfolios import (
     UpdateHoldingRequest,
     PortfolioSummaryResponse,
     PortfolioSummary,
+    PortfolioCostBasisResponse,
 )
-from src.api.watchlist import get_stock_price, get_stock_info
+from src.api.watchlist import get_stock_info_async, get_stock_infos, get_cached_stock_infos
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
-# Thread pool for parallel API calls
-executor = ThreadPoolExecutor(max_workers=5)
+# Holding patches re-read and retry this many times on concurrent changes
+PATCH_MAX_ATTEMPTS = 3
+
+# Summary totals for a portfolio without holdings (Decimal is immutable)
+_ZERO = Decimal(0)
+_EMPTY_SUMMARY_FIELDS = dict(
+    total_holdings=0,
+    total_cost_basis=_ZERO,
+    total_current_value=_ZERO,
+    total_profit_loss=_ZERO,
+    total_return_rate=_ZERO,
+)
+
+# Serialized summaries: (user id, portfolio id, document _etag) -> (cached_until, content).
+# Keying on the ETag makes an entry unreachable as soon as any worker writes
+# the user document; the TTL only bounds how stale the quotes may get.
+_SUMMARY_CACHE_TTL_SECONDS = 15
+_SUMMARY_CACHE_MAX_SIZE = 10_000
+_summary_cache: Dict[Tuple[str, str, str], Tuple[float, dict]] = {}
+
+# Read-side projections; the user id is also the partition key
+PORTFOLIOS_QUERY = (
+    "SELECT p.id, p.name, p.created_at, ARRAY_LENGTH(p.holdings) AS holdings_count, c._etag "
+    "FROM c JOIN p IN c.portfolios WHERE c.id = @user_id"
+)
+PORTFOLIO_QUERY = PORTFOLIOS_QUERY + " AND p.id = @portfolio_id"
+PORTFOLIO_HOLDINGS_QUERY = (
+    "SELECT p AS portfolio, c._etag FROM c JOIN p IN c.portfolios "
+    "WHERE c.id = @user_id AND p.id = @portfolio_id"
+)
+
+# Cost basis summed inside Cosmos; no prices are needed for this view
+PORTFOLIO_COST_BASIS_QUERY = (
+    "SELECT VALUE SUM(h.quantity * h.avg_price) "
+    "FROM c JOIN p IN c.portfolios JOIN h IN p.holdings "
+    "WHERE c.id = @user_id AND p.id = @portfolio_id"
+)
+
+
+def _to_decimal(value: float) -> Decimal:
+    """Convert a float P&L figure to a Decimal with 4 decimal places.
+    
+    Args:
+        value: Computed float value
+        
+    Returns:
+        Decimal suitable for response models
+    """
+    return Decimal(f"{value:.4f}")
+
+
+async def _query_portfolios(container, user_id: str, query: str, portfolio_id: Optional[str] = None) -> list:
+    """Run a portfolio projection query inside the user's partition.
+    
+    Args:
+        container: Async Cosmos DB container
+        user_id: User document id (also the partition key)
+        query: One of the portfolio projection queries
+        portfolio_id: Portfolio ID for single-portfolio queries
+        
+    Returns:
+        List of projected portfolio rows
+    """
+    parameters = [{"name": "@user_id", "value": user_id}]
+    if portfolio_id is not None:
+        parameters.append({"name": "@portfolio_id", "value": portfolio_id})
+    
+    items = container.query_items(
+        query=query,
+        parameters=parameters,
+        partition_key=user_id
+    )
+    return [item async for item in items]
+
+
+def _not_modified(request: Request, response: Response, etag: Optional[str]) -> Optional[Response]:
+    """Tag a response with the user document ETag and honor If-None-Match.
+    
+    Clients must revalidate on every use (no-cache), so browsers can reuse
+    their cached copy after a cheap 304 instead of downloading and us
+    re-serializing an unchanged payload.
+    
+    Args:
+        request: Incoming request
+        response: Response whose headers are being prepared
+        etag: Cosmos DB _etag of the user document
+        
+    Returns:
+        A 304 response if the client's copy is current, otherwise None
+    """
+    if not etag:
+        return None
+    
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    response.headers.update(headers)
+    
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(",")):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return None
+
+
+async def _fetch_user(container, user_id: str) -> dict:
+    """Point-read a user document.
+    
+    Args:
+        container: Async Cosmos DB container
+        user_id: User document id (also the partition key)
+        
+    Returns:
+        User document
+        
+    Raises:
+        HTTPException 404: If the user document does not exist
+    """
+    try:
+        return await container.read_item(item=user_id, partition_key=user_id)
+    except exceptions.CosmosResourceNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+
+
+async def get_user_document(
+    request: Request,
+    user_id: str = Depends(get_current_user_id),
+    container = Depends(get_async_db),
+) -> dict:
+    """Load the current user's document once per request.
+    
+    The document is kept on ``request.state`` so every dependency and handler
+    in the same request shares a single point read.
+    
+    Args:
+        request: Incoming request
+        user_id: Current user ID from JWT token (document id)
+        container: Async Cosmos DB container
+        
+    Returns:
+        User document
+        
+    Raises:
+        HTTPException 404: If the user document does not exist
+        HTTPException 500: If the read fails
+    """
+    user_data = getattr(request.state, "user_doc", None)
+    if user_data is not None:
+        return user_data
+    
+    try:
+        user_data = await _fetch_user(container, user_id)
+    except exceptions.CosmosHttpResponseError as e:
+        logger.error(f"Error reading user document: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Database query failed"
+        )
+    
+    request.state.user_doc = user_data
+    return user_data
+
+
+def _find_portfolio(user_data: dict, portfolio_id: str) -> int:
+    """Locate a portfolio in the user document.
+    
+    Args:
+        user_data: User document
+        portfolio_id: Portfolio ID (UUID)
+        
+    Returns:
+        Array index of the portfolio
+        
+    Raises:
+        HTTPException 404: If the portfolio does not exist
+    """
+    portfolio_index = next(
+        (idx for idx, portfolio in enumerate(user_data.get("portfolios", [])) if portfolio["id"] == portfolio_id),
+        None
+    )
+    
+    if portfolio_index is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Portfolio {portfolio_id} not found"
+        )
+    
+    return portfolio_index
+
+
+def _find_holding(holdings: list, holding_id: str) -> int:
+    """Locate a holding in a portfolio.
+    
+    Args:
+        holdings: Embedded holdings of one portfolio
+        holding_id: Holding ID (UUID)
+        
+    Returns:
+        Array index of the holding
+        
+    Raises:
+        HTTPException 404: If the holding does not exist
+    """
+    holding_index = next(
+        (idx for idx, holding in enumerate(holdings) if holding.get("id") == holding_id),
+        None
+    )
+    
+    if holding_index is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Holding {holding_id} not found"
+        )
+    
+    return holding_index
+
+
+def _add_holding_patch(user_data: dict, portfolio_id: str, holding_dict: dict) -> Tuple[list, str, dict]:
+    """Build the patch that appends a holding to a portfolio.
+    
+    Args:
+        user_data: User document
+        portfolio_id: Portfolio ID (UUID)
+        holding_dict: Holding to append, in stored form
+        
+    Returns:
+        Tuple of (patch operations, filter predicate, appended holding)
+        
+    Raises:
+        HTTPException 400: If holding limit reached or symbol already exists
+        HTTPException 404: If the portfolio does not exist
+    """
+    portfolio_index = _find_portfolio(user_data, portfolio_id)
+    holdings = user_data["portfolios"][portfolio_index].get("holdings", [])
+    
+    # Check if symbol already exists
+    if any(holding["symbol"] == holding_dict["symbol"] for holding in holdings):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Symbol {holding_dict['symbol']} already exists in portfolio"
+        )
+    
+    # Check holdings limit
+    if len(holdings) >= settings.MAX_HOLDINGS_PER_PORTFOLIO:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Holdings limit reached (max {settings.MAX_HOLDINGS_PER_PORTFOLIO} items)"
+        )
+    
+    # Append, provided the portfolio is still at this index, its holdings
+    # haven't grown since the read, and no concurrent add stored the symbol
+    # (a delete plus a duplicate add would leave the length unchanged)
+    portfolio_path = f"c.portfolios[{portfolio_index}]"
+    operations = [{"op": "add", "path": f"/portfolios/{portfolio_index}/holdings/-", "value": holding_dict}]
+    filter_predicate = (
+        f"FROM c WHERE {portfolio_path}.id = {json.dumps(portfolio_id)}"
+        f" AND ARRAY_LENGTH({portfolio_path}.holdings) = {len(holdings)}"
+        f" AND NOT ARRAY_CONTAINS({portfolio_path}.holdings, {{\"symbol\": {json.dumps(holding_dict['symbol'])}}}, true)"
+    )
+    return operations, filter_predicate, holding_dict
+
+
+def _update_holding_patch(
+    user_data: dict,
+    portfolio_id: str,
+    holding_id: str,
+    quantity: Optional[int],
+    avg_price: Optional[float],
+) -> Tuple[list, str, dict]:
+    """Build the patch that changes a holding's quantity and/or average price.
+    
+    Fields left as None keep their stored value and are not patched.
+    
+    Args:
+        user_data: User document
+        portfolio_id: Portfolio ID (UUID)
+        holding_id: Holding ID (UUID)
+        quantity: New number of shares, or None to keep it
+        avg_price: New average price (stored as float, like HoldingItem), or None to keep it
+        
+    Returns:
+        Tuple of (patch operations, filter predicate, updated holding)
+        
+    Raises:
+        HTTPException 404: If portfolio or holding not found
+    """
+    portfolio_index = _find_portfolio(user_data, portfolio_id)
+    holdings = user_data["portfolios"][portfolio_index].get("holdings", [])
+    holding_index = _find_holding(holdings, holding_id)
+    
+    holding = holdings[holding_index]
+    holding_path = f"/portfolios/{portfolio_index}/holdings/{holding_index}"
+    operations = []
+    for field, value in (("quantity", quantity), ("avg_price", avg_price)):
+        if value is not None:
+            holding[field] = value
+            operations.append({"op": "set", "path": f"{holding_path}/{field}", "value": value})
+    
+    filter_predicate = f"FROM c WHERE c.portfolios[{portfolio_index}].holdings[{holding_index}].id = {json.dumps(holding_id)}"
+    return operations, filter_predicate, holding
+
+
+def _remove_holding_patch(user_data: dict, portfolio_id: str, holding_id: str) -> Tuple[list, str, None]:
+    """Build the patch that removes a holding from a portfolio.
+    
+    Args:
+        user_data: User document
+        portfolio_id: Portfolio ID (UUID)
+        holding_id: Holding ID (UUID)
+        
+    Returns:
+        Tuple of (patch operations, filter predicate, None)
+        
+    Raises:
+        HTTPException 404: If portfolio or holding not found
+    """
+    portfolio_index = _find_portfolio(user_data, portfolio_id)
+    holdings = user_data["portfolios"][portfolio_index].get("holdings", [])
+    holding_index = _find_holding(holdings, holding_id)
+    
+    operations = [{"op": "remove", "path": f"/portfolios/{portfolio_index}/holdings/{holding_index}"}]
+    filter_predicate = f"FROM c WHERE c.portfolios[{portfolio_index}].holdings[{holding_index}].id = {json.dumps(holding_id)}"
+    return operations, filter_predicate, None
+
+
+async def _patch_holdings(
+    container,
+    user_id: str,
+    user_data: dict,
+    build_patch: Callable[[dict], Tuple[list, str, Any]],
+) -> Any:
+    """Apply a partial update to the holdings of a user document.
+    
+    Patching sends only the changed holding instead of rewriting the whole
+    document. The filter predicate re-checks the array positions computed
+    from the read, so a concurrent change to the same portfolio fails with
+    412 instead of patching the wrong holding. On 412 only the document is
+    re-read and the patch rebuilt, up to PATCH_MAX_ATTEMPTS times.
+    
+    Args:
+        container: Async Cosmos DB container
+        user_id: User document id (also the partition key)
+        user_data: User document as read by the handler
+        build_patch: Builds (operations, filter predicate, result) from a user document
+        
+    Returns:
+        The result from the build_patch call that was applied
+        
+    Raises:
+        HTTPException 409: If the portfolio kept changing on every attempt
+    """
+    for attempt in range(1, PATCH_MAX_ATTEMPTS + 1):
+        operations, filter_predicate, result = build_patch(user_data)
+        
+        # Nothing to change (e.g. an update with no fields set)
+        if not operations:
+            return result
+        
+        try:
+            await container.patch_item(
+                item=user_id,
+                partition_key=user_id,
+                patch_operations=operations,
+                filter_predicate=filter_predicate
+            )
+            return result
+        except exceptions.CosmosAccessConditionFailedError:
+            logger.info(f"Concurrent portfolio change for user {user_id} (attempt {attempt})")
+        
+        if attempt < PATCH_MAX_ATTEMPTS:
+            user_data = await _fetch_user(container, user_id)
+    
+    raise HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="Portfolio was modified concurrently, please retry"
+    )
 
 
 @router.get("", response_model=list[PortfolioResponse])
 async def list_portfolios(
+    request: Request,
+    response: Response,
     user_id: str = Depends(get_current_user_id),
-    container = Depends(get_db),
+    container = Depends(get_async_db),
 ):
     """List user's portfolios with holdings count.
     
@@ -50,49 +432,50 @@ async def list_portfolios(
     - 단타 (Short-term Trading)
     - 정찰병 (Scout/Watchlist)
     
+    Only portfolio metadata and holdings counts are projected; holdings and
+    the rest of the user document are not transferred. The response carries
+    the user document ETag, and a matching If-None-Match returns 304.
+    
     Args:
+        request: Incoming request
+        response: Response used to set caching headers
         user_id: Current user ID from JWT token (document id)
-        container: Cosmos DB container
+        container: Async Cosmos DB container
         
     Returns:
         List of 3 portfolios with holdings count
     """
-    # Get user document
-    query = "SELECT * FROM c WHERE c.id = @user_id"
-    parameters = [{"name": "@user_id", "value": user_id}]
-    
     try:
-        users = list(container.query_items(
-            query=query,
-            parameters=parameters,
-            enable_cross_partition_query=True
-        ))
+        portfolios = await _query_portfolios(container, user_id, PORTFOLIOS_QUERY)
         
-        if not users:
+        # Every user has portfolios, so no rows means no user document
+        if not portfolios:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="User not found"
             )
         
-        user_data = users[0]
-        portfolios = user_data.get("portfolios", [])
+        not_modified = _not_modified(request, response, portfolios[0].get("_etag"))
+        if not_modified is not None:
+            return not_modified
         
         # Convert to response format with holdings count
         result = []
         for portfolio in portfolios:
-            holdings_count = len(portfolio.get("holdings", []))
             portfolio_response = PortfolioResponse(
                 id=portfolio["id"],
                 user_id=user_id,
                 name=portfolio["name"],
                 created_at=portfolio["created_at"],
                 updated_at=portfolio.get("created_at"),  # Cosmos doesn't track updated_at separately
-                holdings_count=holdings_count
+                holdings_count=portfolio.get("holdings_count") or 0
             )
             result.append(portfolio_response)
         
         return result
         
+    except HTTPException:
+        raise
     except exceptions.CosmosHttpResponseError as e:
         logger.error(f"Error querying portfolios: {e}")
         raise HTTPException(
@@ -104,15 +487,22 @@ async def list_portfolios(
 @router.get("/{portfolio_id}", response_model=PortfolioResponse)
 async def get_portfolio(
     portfolio_id: str,
+    request: Request,
+    response: Response,
     user_id: str = Depends(get_current_user_id),
-    container = Depends(get_db),
+    container = Depends(get_async_db),
 ):
     """Get portfolio details by ID.
     
+    The response carries the user document ETag, and a matching
+    If-None-Match returns 304.
+    
     Args:
         portfolio_id: Portfolio ID (UUID)
+        request: Incoming request
+        response: Response used to set caching headers
         user_id: Current user ID from JWT token
-        container: Cosmos DB container
+        container: Async Cosmos DB container
         
     Returns:
         Portfolio information
@@ -120,38 +510,20 @@ async def get_portfolio(
     Raises:
         HTTPException 404: Portfolio not found or not owned by user
     """
-    # Get user document
-    query = "SELECT * FROM c WHERE c.id = @user_id"
-    parameters = [{"name": "@user_id", "value": user_id}]
-    
     try:
-        users = list(container.query_items(
-            query=query,
-            parameters=parameters,
-            enable_cross_partition_query=True
-        ))
+        portfolios = await _query_portfolios(container, user_id, PORTFOLIO_QUERY, portfolio_id)
         
-        if not users:
+        if not portfolios:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
-                detail="User not found"
+                detail=f"Portfolio {portfolio_id} not found"
             )
         
-        user_data = users[0]
-        portfolios = user_data.get("portfolios", [])
-        
-        # Find portfolio by id
-        portfolio_found = None
-        for portfolio in portfolios:
-            if portfolio["id"] == portfolio_id:
-                portfolio_found = portfolio
-                break
+        portfolio_found = portfolios[0]
         
-        if not portfolio_found:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Portfolio {portfolio_id} not found"
-            )
+        not_modified = _not_modified(request, response, portfolio_found.get("_etag"))
+        if not_modified is not None:
+            return not_modified
         
         return PortfolioResponse(
             id=portfolio_found["id"],
@@ -159,7 +531,7 @@ async def get_portfolio(
             name=portfolio_found["name"],
             created_at=portfolio_found["created_at"],
             updated_at=portfolio_found.get("created_at"),
-            holdings_count=len(portfolio_found.get("holdings", []))
+            holdings_count=portfolio_found.get("holdings_count") or 0
         )
         
     except HTTPException:
@@ -176,7 +548,8 @@ async def get_portfolio(
 async def get_portfolio_summary(
     portfolio_id: str,
     user_id: str = Depends(get_current_user_id),
-    container = Depends(get_db),
+    container = Depends(get_async_db),
+    now: datetime = Depends(now_utc),
 ):
     """Get portfolio summary with holdings and P&L calculations.
     
@@ -186,46 +559,35 @@ async def get_portfolio_summary(
     - Total profit/loss
     - Total profit/loss percentage
     
+    Computed summaries are cached for a few seconds per portfolio and user
+    document ETag, so polling clients don't repeat the quote lookups and P&L
+    math while a holding write on any worker still shows up immediately.
+    
     Args:
         portfolio_id: Portfolio ID (UUID)
         user_id: Current user ID from JWT token
-        container: Cosmos DB container
+        container: Async Cosmos DB container
+        now: Request timestamp, used for holdings without stored timestamps
         
     Returns:
         Portfolio summary with all holdings and aggregated metrics
     """
-    # Get user document
-    query = "SELECT * FROM c WHERE c.id = @user_id"
-    parameters = [{"name": "@user_id", "value": user_id}]
-    
     try:
-        users = list(container.query_items(
-            query=query,
-            parameters=parameters,
-            enable_cross_partition_query=True
-        ))
+        # Only this portfolio is transferred, not the whole user document
+        portfolios = await _query_portfolios(container, user_id, PORTFOLIO_HOLDINGS_QUERY, portfolio_id)
         
-        if not users:
+        if not portfolios:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
-                detail="User not found"
+                detail=f"Portfolio {portfolio_id} not found"
             )
         
-        user_data = users[0]
-        portfolios = user_data.get("portfolios", [])
+        portfolio_found = portfolios[0]["portfolio"]
         
-        # Find portfolio
-        portfolio_found = None
-        for portfolio in portfolios:
-            if portfolio["id"] == portfolio_id:
-                portfolio_found = portfolio
-                break
-        
-        if not portfolio_found:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Portfolio {portfolio_id} not found"
-            )
+        cache_key = (user_id, portfolio_id, portfolios[0]["_etag"])
+        cached = _summary_cache.get(cache_key)
+        if cached is not None and time.monotonic() < cached[0]:
+            return ORJSONResponse(content=cached[1])
         
         holdings = portfolio_found.get("holdings", [])
         
@@ -240,79 +602,72 @@ async def get_portfolio_summary(
                     holdings_count=0
                 ),
                 holdings=[],
-                summary=PortfolioSummary(
-                    total_holdings=0,
-                    total_cost_basis=Decimal(0),
-                    total_current_value=Decimal(0),
-                    total_profit_loss=Decimal(0),
-                    total_return_rate=Decimal(0)
-                )
+                summary=PortfolioSummary(**_EMPTY_SUMMARY_FIELDS)
             )
         
-        # Fetch stock info for all holdings in parallel
-        symbols = [holding["symbol"] for holding in holdings]
-        loop = asyncio.get_event_loop()
-        
-        stock_infos = await asyncio.gather(*[
-            loop.run_in_executor(executor, get_stock_info, symbol)
-            for symbol in symbols
-        ])
-        
-        # Map symbol to stock info
-        symbol_to_info = {symbol: info for symbol, info in zip(symbols, stock_infos)}
-        
-        # Build holdings responses with P&L calculations
-        holdings_responses = []
-        total_current_value = Decimal(0)
-        total_cost_basis = Decimal(0)
-        
-        for holding in holdings:
-            symbol = holding["symbol"]
-            quantity = Decimal(str(holding["quantity"]))
-            avg_price = Decimal(str(holding["avg_price"]))
-            stock_info = symbol_to_info.get(symbol, {})
-            current_price = stock_info.get("current_price")
-            
-            # Calculate cost basis
-            cost_basis = quantity * avg_price
-            total_cost_basis += cost_basis
-            
-            # Calculate market value and P&L if current price available
-            if current_price:
-                current_price_decimal = Decimal(str(current_price))
-                market_value = quantity * current_price_decimal
-                profit_loss = market_value - cost_basis
-                return_rate = (profit_loss / cost_basis * 100) if cost_basis > 0 else Decimal(0)
-                total_current_value += market_value
-            else:
-                market_value = cost_basis
-                profit_loss = Decimal(0)
-                return_rate = Decimal(0)
-                total_current_value += market_value
-            
-            holding_response = HoldingResponse(
-                id=holding.get("id", str(uuid.uuid4())),  # Generate if missing
+        # Serve warm quotes straight from the cache; only stale symbols are
+        # fetched, in one batched async lookup
+        symbol_to_info, stale = get_cached_stock_infos([holding["symbol"] for holding in holdings])
+        if stale:
+            symbol_to_info.update(await get_stock_infos(stale))
+        
+        # Vectorized P&L in float64; values become Decimal only for the response
+        count = len(holdings)
+        quantities = np.fromiter((h["quantity"] for h in holdings), dtype=np.float64, count=count)
+        avg_prices = np.fromiter((h["avg_price"] for h in holdings), dtype=np.float64, count=count)
+        current_prices = np.fromiter(
+            (symbol_to_info.get(h["symbol"], {}).get("current_price") or 0.0 for h in holdings),
+            dtype=np.float64,
+            count=count
+        )
+        has_price = current_prices != 0
+        
+        (
+            cost_bases,
+            current_values,
+            profit_losses,
+            return_rates,
+            total_cost_basis,
+            total_current_value,
+        ) = compute_pnl(quantities, avg_prices, current_prices)
+        
+        # Build holdings responses in one comprehension over the computed columns.
+        # Every field is already the declared type (Cosmos-sourced strings and
+        # computed Decimals), so skip per-field validation for up to 100 rows.
+        # Stored and quoted prices are reported exactly; only the kernel's
+        # float outputs are rounded.
+        holdings_responses = [
+            HoldingResponse.model_construct(
+                id=holding.get("id") or str(uuid.uuid4()),  # Generate if missing
                 portfolio_id=portfolio_id,
-                symbol=symbol,
-                company_name=stock_info.get("company_name"),
-                quantity=int(quantity),
-                avg_price=avg_price,
-                cost_basis=cost_basis,
-                current_price=current_price_decimal if current_price else None,
-                current_value=market_value,
-                profit_loss=profit_loss,
-                return_rate=return_rate,
+                symbol=holding["symbol"],
+                company_name=symbol_to_info.get(holding["symbol"], {}).get("company_name"),
+                quantity=int(holding["quantity"]),
+                avg_price=Decimal(str(holding["avg_price"])),
+                cost_basis=_to_decimal(cost_basis),
+                current_price=Decimal(str(symbol_to_info[holding["symbol"]]["current_price"])) if priced else None,
+                current_value=_to_decimal(market_value),
+                profit_loss=_to_decimal(profit_loss),
+                return_rate=_to_decimal(return_rate),
                 notes=holding.get("notes"),
-                created_at=holding.get("created_at", datetime.now()),
-                updated_at=holding.get("updated_at", datetime.now())
+                created_at=holding.get("created_at", now),
+                updated_at=holding.get("updated_at", now)
+            )
+            for holding, priced, cost_basis, market_value, profit_loss, return_rate in zip(
+                holdings,
+                has_price.tolist(),
+                cost_bases.tolist(),
+                current_values.tolist(),
+                profit_losses.tolist(),
+                return_rates.tolist()
             )
-            holdings_responses.append(holding_response)
+        ]
         
         # Calculate total P&L
         total_profit_loss = total_current_value - total_cost_basis
-        total_return_rate = (total_profit_loss / total_cost_basis * 100) if total_cost_basis > 0 else Decimal(0)
+        total_return_rate = (total_profit_loss / total_cost_basis * 100) if total_cost_basis > 0 else 0.0
         
-        return PortfolioSummaryResponse(
+        response = PortfolioSummaryResponse(
             portfolio=PortfolioResponse(
                 id=portfolio_found["id"],
                 user_id=user_id,
@@ -324,13 +679,23 @@ async def get_portfolio_summary(
             holdings=holdings_responses,
             summary=PortfolioSummary(
                 total_holdings=len(holdings),
-                total_cost_basis=total_cost_basis,
-                total_current_value=total_current_value,
-                total_profit_loss=total_profit_loss,
-                total_return_rate=total_return_rate
+                total_cost_basis=_to_decimal(total_cost_basis),
+                total_current_value=_to_decimal(total_current_value),
+                total_profit_loss=_to_decimal(total_profit_loss),
+                total_return_rate=_to_decimal(total_return_rate)
             )
         )
         
+        # Serialize once here instead of letting FastAPI re-validate the
+        # unvalidated holdings against response_model
+        content = response.model_dump(mode="json")
+        
+        if len(_summary_cache) >= _SUMMARY_CACHE_MAX_SIZE:
+            _summary_cache.clear()
+        _summary_cache[cache_key] = (time.monotonic() + _SUMMARY_CACHE_TTL_SECONDS, content)
+        
+        return ORJSONResponse(content=content)
+        
     except HTTPException:
         raise
     except exceptions.CosmosHttpResponseError as e:
@@ -341,109 +706,121 @@ async def get_portfolio_summary(
         )
 
 
-@router.post("/{portfolio_id}/holdings", response_model=HoldingResponse, status_code=status.HTTP_201_CREATED)
-async def add_holding(
+@router.get("/{portfolio_id}/cost-basis", response_model=PortfolioCostBasisResponse)
+async def get_portfolio_cost_basis(
     portfolio_id: str,
-    request: AddHoldingRequest,
     user_id: str = Depends(get_current_user_id),
-    container = Depends(get_db),
+    container = Depends(get_async_db),
 ):
-    """Add a new holding to portfolio.
+    """Get the total cost basis of a portfolio without live prices.
+    
+    The sum is computed by an aggregate query in Cosmos DB, issued
+    concurrently with the portfolio lookup that checks ownership.
     
     Args:
         portfolio_id: Portfolio ID (UUID)
-        request: Holding data (symbol, quantity, avg_price)
         user_id: Current user ID from JWT token
-        container: Cosmos DB container
+        container: Async Cosmos DB container
         
     Returns:
-        Created holding
+        Holding count and total cost basis
         
     Raises:
-        HTTPException 400: If holding limit reached or symbol already exists
+        HTTPException 404: Portfolio not found or not owned by user
     """
-    # Get user document
-    query = "SELECT * FROM c WHERE c.id = @user_id"
-    parameters = [{"name": "@user_id", "value": user_id}]
-    
     try:
-        users = list(container.query_items(
-            query=query,
-            parameters=parameters,
-            enable_cross_partition_query=True
-        ))
-        
-        if not users:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User not found"
-            )
-        
-        user_data = users[0]
-        portfolios = user_data.get("portfolios", [])
-        
-        # Find portfolio
-        portfolio_index = None
-        for idx, portfolio in enumerate(portfolios):
-            if portfolio["id"] == portfolio_id:
-                portfolio_index = idx
-                break
+        portfolios, sums = await asyncio.gather(
+            _query_portfolios(container, user_id, PORTFOLIO_QUERY, portfolio_id),
+            _query_portfolios(container, user_id, PORTFOLIO_COST_BASIS_QUERY, portfolio_id),
+        )
         
-        if portfolio_index is None:
+        if not portfolios:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Portfolio {portfolio_id} not found"
             )
         
-        portfolio = portfolios[portfolio_index]
-        holdings = portfolio.get("holdings", [])
+        # SUM over no holdings is undefined, so the result may be empty
+        total_cost_basis = sums[0] if sums and sums[0] is not None else 0
         
-        # Check if symbol already exists
-        if any(h["symbol"] == request.symbol for h in holdings):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Symbol {request.symbol} already exists in portfolio"
-            )
+        return PortfolioCostBasisResponse(
+            portfolio_id=portfolio_id,
+            total_holdings=portfolios[0].get("holdings_count") or 0,
+            total_cost_basis=_to_decimal(total_cost_basis)
+        )
         
-        # Check holdings limit
-        if len(holdings) >= settings.MAX_HOLDINGS_PER_PORTFOLIO:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Holdings limit reached (max {settings.MAX_HOLDINGS_PER_PORTFOLIO} items)"
-            )
+    except HTTPException:
+        raise
+    except exceptions.CosmosHttpResponseError as e:
+        logger.error(f"Error querying portfolio cost basis: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Database query failed"
+        )
+
+
+@router.post("/{portfolio_id}/holdings", response_model=HoldingResponse, status_code=status.HTTP_201_CREATED)
+async def add_holding(
+    portfolio_id: str,
+    request: AddHoldingRequest,
+    user_id: str = Depends(get_current_user_id),
+    user_data: dict = Depends(get_user_document),
+    container = Depends(get_async_db),
+    now: datetime = Depends(now_utc),
+):
+    """Add a new holding to portfolio.
+    
+    Args:
+        portfolio_id: Portfolio ID (UUID)
+        request: Holding data (symbol, quantity, avg_price)
+        user_id: Current user ID from JWT token
+        user_data: Current user document
+        container: Async Cosmos DB container
+        now: Request timestamp, stored as purchase_date
         
-        # Create new holding
+    Returns:
+        Created holding
+        
+    Raises:
+        HTTPException 400: If holding limit reached or symbol already exists
+        HTTPException 409: If the portfolio changed concurrently
+    """
+    try:
+        # Create new holding; the timestamp is reused for the response
+        purchase_date = now
         new_holding = HoldingItem(
             symbol=request.symbol,
             quantity=request.quantity,
             avg_price=request.avg_price,
-            purchase_date=datetime.utcnow()
+            purchase_date=purchase_date
         )
         
-        # Add to holdings array
         holding_dict = new_holding.model_dump(mode='json')
         holding_dict["id"] = str(uuid.uuid4())  # Add unique id for holding
-        holdings.append(holding_dict)
         
-        # Update portfolio
-        portfolio["holdings"] = holdings
-        portfolios[portfolio_index] = portfolio
-        user_data["portfolios"] = portfolios
+        # Start the quote lookup so it overlaps the Cosmos write
+        stock_lookup = asyncio.ensure_future(get_stock_info_async(request.symbol))
         
-        # Update document
-        updated_user = container.replace_item(
-            item=user_data["id"],
-            body=user_data
-        )
+        try:
+            await _patch_holdings(
+                container,
+                user_id,
+                user_data,
+                lambda doc: _add_holding_patch(doc, portfolio_id, holding_dict)
+            )
+        except BaseException:
+            # Don't leave the lookup running unawaited
+            stock_lookup.cancel()
+            raise
         
         logger.info(f"Added holding {request.symbol} to portfolio {portfolio_id}")
         
         # Calculate P&L for response
-        stock_info = get_stock_info(request.symbol)
+        stock_info = await stock_lookup
         current_price = stock_info.get("current_price")
         company_name = stock_info.get("company_name")
-        quantity = Decimal(str(request.quantity))
-        avg_price = Decimal(str(request.avg_price))
+        quantity = Decimal(request.quantity)
+        avg_price = request.avg_price
         cost_basis = quantity * avg_price
         
         if current_price:
@@ -470,8 +847,8 @@ async def add_holding(
             profit_loss=profit_loss,
             return_rate=return_rate,
             notes=None,
-            created_at=datetime.fromisoformat(holding_dict["purchase_date"]) if isinstance(holding_dict["purchase_date"], str) else holding_dict["purchase_date"],
-            updated_at=datetime.fromisoformat(holding_dict["purchase_date"]) if isinstance(holding_dict["purchase_date"], str) else holding_dict["purchase_date"]
+            created_at=purchase_date,
+            updated_at=purchase_date
         )
         
     except HTTPException:
@@ -490,7 +867,9 @@ async def update_holding(
     holding_id: str,
     request: UpdateHoldingRequest,
     user_id: str = Depends(get_current_user_id),
-    container = Depends(get_db),
+    user_data: dict = Depends(get_user_document),
+    container = Depends(get_async_db),
+    now: datetime = Depends(now_utc),
 ):
     """Update existing holding quantity and/or average price.
     
@@ -499,88 +878,51 @@ async def update_holding(
         holding_id: Holding ID (UUID)
         request: Updated holding data
         user_id: Current user ID from JWT token
-        container: Cosmos DB container
+        user_data: Current user document
+        container: Async Cosmos DB container
+        now: Request timestamp, reported as updated_at
         
     Returns:
         Updated holding
         
     Raises:
         HTTPException 404: If portfolio or holding not found
+        HTTPException 409: If the portfolio changed concurrently
     """
-    # Get user document
-    query = "SELECT * FROM c WHERE c.id = @user_id"
-    parameters = [{"name": "@user_id", "value": user_id}]
-    
     try:
-        users = list(container.query_items(
-            query=query,
-            parameters=parameters,
-            enable_cross_partition_query=True
-        ))
-        
-        if not users:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User not found"
-            )
-        
-        user_data = users[0]
-        portfolios = user_data.get("portfolios", [])
-        
-        # Find portfolio
-        portfolio_index = None
-        for idx, portfolio in enumerate(portfolios):
-            if portfolio["id"] == portfolio_id:
-                portfolio_index = idx
-                break
-        
-        if portfolio_index is None:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Portfolio {portfolio_id} not found"
-            )
-        
-        portfolio = portfolios[portfolio_index]
-        holdings = portfolio.get("holdings", [])
-        
-        # Find holding
-        holding_index = None
-        for idx, holding in enumerate(holdings):
-            if holding.get("id") == holding_id:
-                holding_index = idx
-                break
-        
-        if holding_index is None:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Holding {holding_id} not found"
+        portfolio_index = _find_portfolio(user_data, portfolio_id)
+        holdings = user_data["portfolios"][portfolio_index].get("holdings", [])
+        symbol = holdings[_find_holding(holdings, holding_id)]["symbol"]
+        
+        # Start the quote lookup so it overlaps the Cosmos write
+        stock_lookup = asyncio.ensure_future(get_stock_info_async(symbol))
+        
+        try:
+            holding = await _patch_holdings(
+                container,
+                user_id,
+                user_data,
+                lambda doc: _update_holding_patch(
+                    doc,
+                    portfolio_id,
+                    holding_id,
+                    request.quantity,
+                    float(request.avg_price) if request.avg_price is not None else None
+                )
             )
-        
-        # Update holding
-        holding = holdings[holding_index]
-        holding["quantity"] = request.quantity
-        holding["avg_price"] = request.avg_price
-        holdings[holding_index] = holding
-        
-        # Update portfolio
-        portfolio["holdings"] = holdings
-        portfolios[portfolio_index] = portfolio
-        user_data["portfolios"] = portfolios
-        
-        # Update document
-        updated_user = container.replace_item(
-            item=user_data["id"],
-            body=user_data
-        )
+        except BaseException:
+            stock_lookup.cancel()
+            raise
         
         logger.info(f"Updated holding {holding_id} in portfolio {portfolio_id}")
         
         # Calculate P&L for response
-        stock_info = get_stock_info(holding["symbol"])
+        stock_info = await stock_lookup
         current_price = stock_info.get("current_price")
         company_name = stock_info.get("company_name")
-        quantity = Decimal(str(request.quantity))
-        avg_price = Decimal(str(request.avg_price))
+        # Fields missing from a partial update come from the stored holding
+        quantity = Decimal(holding["quantity"])
+        avg_price = request.avg_price if request.avg_price is not None else Decimal(str(holding["avg_price"]))
         cost_basis = quantity * avg_price
         
         if current_price:
@@ -599,7 +941,7 @@ async def update_holding(
             portfolio_id=portfolio_id,
             symbol=holding["symbol"],
             company_name=company_name,
-            quantity=request.quantity,
+            quantity=holding["quantity"],
             avg_price=avg_price,
             cost_basis=cost_basis,
             current_price=current_price_decimal,
@@ -607,8 +949,8 @@ async def update_holding(
             profit_loss=profit_loss,
             return_rate=return_rate,
             notes=holding.get("notes"),
-            created_at=datetime.fromisoformat(holding["purchase_date"]) if isinstance(holding["purchase_date"], str) else holding["purchase_date"],
-            updated_at=datetime.now()
+            created_at=holding["purchase_date"],  # ISO string, parsed by the response model
+            updated_at=now
         )
         
     except HTTPException:
@@ -626,7 +968,8 @@ async def delete_holding(
     portfolio_id: str,
     holding_id: str,
     user_id: str = Depends(get_current_user_id),
-    container = Depends(get_db),
+    user_data: dict = Depends(get_user_document),
+    container = Depends(get_async_db),
 ):
     """Delete holding from portfolio.
     
@@ -634,71 +977,19 @@ async def delete_holding(
         portfolio_id: Portfolio ID (UUID)
         holding_id: Holding ID (UUID)
         user_id: Current user ID from JWT token
-        container: Cosmos DB container
+        user_data: Current user document
+        container: Async Cosmos DB container
         
     Raises:
         HTTPException 404: If portfolio or holding not found
+        HTTPException 409: If the portfolio changed concurrently
     """
-    # Get user document
-    query = "SELECT * FROM c WHERE c.id = @user_id"
-    parameters = [{"name": "@user_id", "value": user_id}]
-    
     try:
-        users = list(container.query_items(
-            query=query,
-            parameters=parameters,
-            enable_cross_partition_query=True
-        ))
-        
-        if not users:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User not found"
-            )
-        
-        user_data = users[0]
-        portfolios = user_data.get("portfolios", [])
-        
-        # Find portfolio
-        portfolio_index = None
-        for idx, portfolio in enumerate(portfolios):
-            if portfolio["id"] == portfolio_id:
-                portfolio_index = idx
-                break
-        
-        if portfolio_index is None:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Portfolio {portfolio_id} not found"
-            )
-        
-        portfolio = portfolios[portfolio_index]
-        holdings = portfolio.get("holdings", [])
-        
-        # Find and remove holding
-        holding_found = False
-        updated_holdings = []
-        for holding in holdings:
-            if holding.get("id") == holding_id:
-                holding_found = True
-            else:
-                updated_holdings.append(holding)
-        
-        if not holding_found:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Holding {holding_id} not found"
-            )
-        
-        # Update portfolio
-        portfolio["holdings"] = updated_holdings
-        portfolios[portfolio_index] = portfolio
-        user_data["portfolios"] = portfolios
-        
-        # Update document
-        container.replace_item(
-            item=user_data["id"],
-            body=user_data
+        await _patch_holdings(
+            container,
+            user_id,
+            user_data,
+            lambda doc: _remove_holding_patch(doc, portfolio_id, holding_id)
         )
         
         logger.info(f"Deleted holding {holding_id} from portfolio {portfolio_id}")
@@ -1,15 +1,19 @@
 """Stock data API endpoints.
 
-Handles stock quote retrieval and candlestick chart data without caching (Cosmos DB migration).
+Handles stock quote retrieval (with a short in-process quote cache) and candlestick chart data.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
+from fastapi.responses import ORJSONResponse
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
+import asyncio
 import logging
+import time
 
 from src.core.database import get_db
 from src.core.config import settings
+from src.core.single_flight import SingleFlight
 # Legacy SQLAlchemy models (commented out for Cosmos DB migration)
 # from src.models import StockQuote, CandlestickData
 # from src.models.stock_quote import MarketStatus, Market
@@ -17,10 +21,10 @@ from src.core.config import settings
 from src.schemas.stocks import (
     PeriodEnum,
     StockQuoteResponse,
-    CandlestickResponse,
     ChartDataResponse,
     NewsResponse,
     NewsItemResponse,
+    StockMoverItem,
     TopMoversResponse,
 )
 from src.services.stock_data_service import StockDataService
@@ -34,13 +38,135 @@ router = APIRouter()
 # Create a singleton instance of StockDataService
 stock_service = StockDataService()
 
+# Recent quotes: symbol -> (cached_until, quote data with fetch time)
+_QUOTE_CACHE_MAX_SIZE = 10_000
+_quote_cache: Dict[str, Tuple[float, dict]] = {}
+
+# Recent news: (symbol, limit) -> (cached_until, articles)
+_NEWS_CACHE_TTL_SECONDS = 300
+_NEWS_CACHE_MAX_SIZE = 1024
+_news_cache: Dict[Tuple[str, int], Tuple[float, list]] = {}
+
+# Latest top movers: (cached_until, data); refreshed hourly upstream
+_TOP_MOVERS_CACHE_TTL_SECONDS = 900
+_top_movers_cache: Optional[Tuple[float, dict]] = None
+
+# Concurrent cache misses for the same key share one upstream call
+_upstream_calls = SingleFlight()
+
+
+async def _get_cached_quote(symbol: str) -> Optional[dict]:
+    """Get a quote, serving repeat requests from the in-process cache.
+    
+    Misses are fetched over the shared async HTTP session, coalesced with
+    any concurrent miss for the same symbol.
+    
+    Args:
+        symbol: Upper-case stock ticker symbol
+        
+    Returns:
+        Quote data from StockDataService plus 'updated_at' (when it was
+        fetched), or None if unavailable
+    """
+    now = time.monotonic()
+    cached = _quote_cache.get(symbol)
+    if cached is not None and now < cached[0]:
+        return cached[1]
+    
+    quote_data = await _upstream_calls.run(
+        ("quote", symbol),
+        lambda: stock_service.get_quote_async(symbol)
+    )
+    
+    if not quote_data:
+        return None
+    
+    # Only successful lookups are cached so an outage doesn't stick
+    quote_data = {**quote_data, 'updated_at': datetime.utcnow()}
+    if len(_quote_cache) >= _QUOTE_CACHE_MAX_SIZE:
+        _quote_cache.clear()
+    _quote_cache[symbol] = (now + settings.STOCK_CACHE_TTL_SECONDS, quote_data)
+    
+    return quote_data
+
+
+async def _get_cached_news(symbol: str, limit: int) -> list:
+    """Get news articles, serving repeat requests from the in-process cache.
+    
+    Misses are fetched over the shared async HTTP session, coalesced with
+    any concurrent miss for the same key.
+    
+    Args:
+        symbol: Upper-case stock ticker symbol
+        limit: Number of articles requested
+        
+    Returns:
+        List of news articles from StockDataService (empty if unavailable)
+    """
+    now = time.monotonic()
+    key = (symbol, limit)
+    cached = _news_cache.get(key)
+    if cached is not None and now < cached[0]:
+        return cached[1]
+    
+    news_data = await _upstream_calls.run(
+        ("news", symbol, limit),
+        lambda: stock_service.get_news_async(symbol, limit=limit)
+    )
+    
+    # Empty results may be an upstream error, so they are not cached
+    if news_data:
+        if len(_news_cache) >= _NEWS_CACHE_MAX_SIZE:
+            _news_cache.clear()
+        _news_cache[key] = (now + _NEWS_CACHE_TTL_SECONDS, news_data)
+    
+    return news_data
+
+
+async def _get_cached_top_movers() -> Optional[dict]:
+    """Get the latest top movers, serving repeat requests from the in-process cache.
+    
+    The Cosmos DB document is only updated hourly, so it is read at most
+    once per TTL instead of on every request.
+    
+    Returns:
+        Top movers data from the service, or None if unavailable
+    """
+    global _top_movers_cache
+    
+    now = time.monotonic()
+    if _top_movers_cache is not None and now < _top_movers_cache[0]:
+        return _top_movers_cache[1]
+    
+    data = await _upstream_calls.run(
+        "top_movers",
+        lambda: asyncio.to_thread(top_movers_service.get_top_movers)
+    )
+    
+    if data:
+        _top_movers_cache = (now + _TOP_MOVERS_CACHE_TTL_SECONDS, data)
+    
+    return data
+
+
+def _mover_items(items: List[dict]) -> List[StockMoverItem]:
+    """Build top mover items without re-validating the stored strings.
+    
+    Args:
+        items: Top mover entries from the stored snapshot
+        
+    Returns:
+        List of StockMoverItem
+    """
+    return [StockMoverItem.model_construct(**item) for item in items]
+
 
 @router.get("/top-movers", response_model=TopMoversResponse)
 async def get_top_movers():
     """Get current market top movers (gainers, losers, most active).
     
-    Fetches data from Alpha Vantage TOP_GAINERS_LOSERS endpoint.
-    Data is cached for 4 hours to minimize API calls.
+    Reads the hourly snapshot stored in Cosmos DB (from Alpha Vantage
+    TOP_GAINERS_LOSERS), cached in process for 15 minutes.
     
     Returns:
         TopMoversResponse: Contains three lists with stock data
@@ -50,7 +176,7 @@ async def get_top_movers():
         HTTPException(429): Too many requests (rate limit)
     """
     try:
-        data = top_movers_service.get_top_movers()
+        data = await _get_cached_top_movers()
         
         if not data:
             raise HTTPException(
@@ -58,14 +184,19 @@ async def get_top_movers():
                 detail="Unable to fetch top movers data. Please try again later."
             )
         
-        return TopMoversResponse(
+        # Items are stored as returned by Alpha Vantage (all string fields)
+        response = TopMoversResponse.model_construct(
             metadata=data.get('metadata', ''),
             last_updated=data.get('last_updated', ''),
-            top_gainers=data.get('top_gainers', []),
-            top_losers=data.get('top_losers', []),
-            most_actively_traded=data.get('most_actively_traded', [])
+            top_gainers=_mover_items(data.get('top_gainers', [])),
+            top_losers=_mover_items(data.get('top_losers', [])),
+            most_actively_traded=_mover_items(data.get('most_actively_traded', []))
         )
         
+        # Serialize once here instead of letting FastAPI re-validate every
+        # item against response_model
+        return ORJSONResponse(content=response.model_dump(mode="json"))
+        
     except HTTPException:
         raise
     except Exception as e:
@@ -77,13 +208,18 @@ async def get_top_movers():
 
 
 @router.get("/{symbol}", response_model=StockQuoteResponse)
-async def get_stock_quote(symbol: str):
-    """Get stock quote directly from Alpha Vantage API (no caching).
+async def get_stock_quote(symbol: str, request: Request, response: Response):
+    """Get stock quote from Alpha Vantage API.
     
     Fetches current stock price, daily change, volume, and market status.
+    Quotes are cached in process for STOCK_CACHE_TTL_SECONDS. The response
+    carries an ETag for the cached quote, and a matching If-None-Match
+    returns 304 until the quote is refreshed.
     
     Args:
         symbol: Stock ticker symbol (e.g., 'AAPL', 'TSLA')
+        request: Incoming request
+        response: Response used to set caching headers
         
     Returns:
         Stock quote data
@@ -93,8 +229,7 @@ async def get_stock_quote(symbol: str):
     """
     symbol = symbol.upper()
     
-    # Fetch from Alpha Vantage
-    quote_data = stock_service.get_quote(symbol)
+    quote_data = await _get_cached_quote(symbol)
     
     if not quote_data:
         raise HTTPException(
@@ -102,14 +237,24 @@ async def get_stock_quote(symbol: str):
             detail=f"Stock symbol '{symbol}' not found or data unavailable"
         )
     
-    return StockQuoteResponse(
+    updated_at = quote_data['updated_at']
+    etag = f'"{symbol}-{updated_at.isoformat()}"'
+    headers = {"ETag": etag, "Cache-Control": "public, no-cache"}
+    
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(",")):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    
+    # Service output already has the declared types (floats, ints, enums)
+    return StockQuoteResponse.model_construct(
         symbol=symbol,
         current_price=quote_data.get('current_price'),
         daily_change_pct=quote_data.get('daily_change_pct'),
         volume=quote_data.get('volume'),
         market_status=quote_data.get('market_status', 'unknown'),
         market=quote_data.get('market', 'US'),
-        updated_at=datetime.utcnow()
+        updated_at=updated_at
     )
 
 
@@ -145,25 +290,27 @@ async def get_chart_data(
             detail=f"Chart data not available for symbol '{symbol}' with period '{period.value}'"
         )
     
-    # Convert to response format
+    # Serialize the service's dicts directly with orjson (datetimes and floats
+    # are encoded in C) instead of building and re-validating a model per candle.
+    # Only the CandlestickResponse fields are copied; adj_close is not exposed.
     candlesticks = [
-        CandlestickResponse(
-            date=candle['date'],
-            open=candle['open'],
-            high=candle['high'],
-            low=candle['low'],
-            close=candle['close'],
-            volume=candle['volume']
-        )
+        {
+            'date': candle['date'],
+            'open': candle['open'],
+            'high': candle['high'],
+            'low': candle['low'],
+            'close': candle['close'],
+            'volume': candle['volume']
+        }
         for candle in candle_data
     ]
     
-    return ChartDataResponse(
-        symbol=symbol,
-        period=period,
-        candlesticks=candlesticks,
-        total=len(candlesticks)
-    )
+    return ORJSONResponse(content={
+        'symbol': symbol,
+        'period': period.value,
+        'candlesticks': candlesticks,
+        'total': len(candlesticks)
+    })
 
 
 @router.get("/{symbol}/news", response_model=NewsResponse)
@@ -173,8 +320,8 @@ async def get_stock_news(
 ):
     """Get news articles for a stock symbol.
     
-    Fetches recent news articles directly from Alpha Vantage API.
-    No database caching is used for news data.
+    Fetches recent news articles from Alpha Vantage API. Results are cached
+    in process for 5 minutes per symbol and limit.
     
     Args:
         symbol: Stock ticker symbol (e.g., 'AAPL', 'IBM')
@@ -186,8 +333,7 @@ async def get_stock_news(
     """
     symbol = symbol.upper()
     
-    # Fetch news directly from Alpha Vantage via StockDataService (no DB involved)
-    news_data = stock_service.get_news(symbol, limit=limit)
+    news_data = await _get_cached_news(symbol, limit)
     
     # news_data is always a list (empty list if no news)
     if news_data is None or len(news_data) == 0:
@@ -198,9 +344,9 @@ async def get_stock_news(
             total=0
         )
     
-    # Convert to response format
+    # Convert to response format; the service already parsed published_at
     news_items = [
-        NewsItemResponse(
+        NewsItemResponse.model_construct(
             title=item['title'],
             summary=item['summary'],
             publisher=item['publisher'],
@@ -211,8 +357,12 @@ async def get_stock_news(
         for item in news_data
     ]
     
-    return NewsResponse(
+    response = NewsResponse.model_construct(
         symbol=symbol,
         news=news_items,
         total=len(news_items)
     )
+    
+    # Serialize once here instead of letting FastAPI re-validate every
+    # article against response_model
+    return ORJSONResponse(content=response.model_dump(mode="json"))
@@ -4,16 +4,18 @@ Handles watchlist CRUD operations and reordering with Cosmos DB.
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from azure.core import MatchConditions
 from azure.cosmos import exceptions
-from typing import List
+from typing import Any, Callable, Dict, List, Optional, Tuple
 import logging
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
+import time
 from datetime import datetime
 
-from src.core.database import get_db
+from src.core.database import get_async_db
 from src.core.config import settings
-from src.core.middleware import get_current_user_id
+from src.core.middleware import get_current_user_id, now_utc
+from src.core.single_flight import SingleFlight
 from src.models.user import UserDocument, WatchlistItem
 from src.schemas.watchlist import (
     WatchlistAddRequest,
@@ -31,82 +33,115 @@ logger = logging.getLogger(__name__)
 # Create stock data service instance
 stock_service = StockDataService()
 
-# Thread pool for parallel API calls
-executor = ThreadPoolExecutor(max_workers=5)
+# get_watchlist only needs the watchlist, not the portfolios stored alongside it
+WATCHLIST_QUERY = "SELECT c.watchlists FROM c WHERE c.id = @user_id"
 
+# Cosmos DB limit on operations in a single patch request
+PATCH_MAX_OPERATIONS = 10
 
-def get_stock_price(symbol: str):
-    """Get current stock price from Alpha Vantage.
+# Attempts for a watchlist patch whose ETag check fails because of a
+# concurrent write; retries back off from PATCH_RETRY_BASE_DELAY_SECONDS
+PATCH_MAX_ATTEMPTS = 3
+PATCH_RETRY_BASE_DELAY_SECONDS = 0.05
+
+# Recent stock info lookups: symbol -> (cached_until, info dict)
+_STOCK_INFO_CACHE_TTL_SECONDS = 30
+_STOCK_INFO_CACHE_MAX_SIZE = 1024
+_stock_info_cache: Dict[str, Tuple[float, dict]] = {}
+
+# Concurrent async quote lookups for the same symbol share one request
+_quote_lookups = SingleFlight()
+
+# Concurrent bulk lookups for the same symbol set (e.g. one user's watchlist
+# open in several tabs) share one bulk request
+_bulk_quote_lookups = SingleFlight()
+
+
+def _build_stock_info(symbol: str, quote_data: dict) -> dict:
+    """Convert a StockDataService quote into the stock info dict.
     
     Args:
         symbol: Stock ticker symbol
+        quote_data: Quote returned by StockDataService
         
     Returns:
-        Current stock price (float), or None if unavailable
+        Dictionary with price, change, percent, and company name
     """
-    try:
-        logger.info(f"[PRICE] Fetching price for symbol: {symbol}")
-        quote_data = stock_service.get_quote(symbol)
-        
-        if not quote_data:
-            logger.warning(f"[PRICE] No data returned for {symbol}")
-            return None
-        
-        price = quote_data.get('current_price')
-        logger.info(f"[PRICE] {symbol} - Returning: {price}")
+    return {
+        'current_price': quote_data.get('current_price'),
+        'price_change': quote_data.get('price_change'),
+        'change_percent': quote_data.get('daily_change_pct'),
+        'market_cap': None,  # TODO: Cache in DB to reduce API calls
+        'company_name': symbol  # Using symbol for now, can be enhanced with DB cache
+    }
+
+
+def _cache_stock_info(symbol: str, info: dict, now: float) -> None:
+    """Remember a stock info lookup if it produced a price.
+    
+    Args:
+        symbol: Stock ticker symbol
+        info: Stock info dict
+        now: Current time.monotonic() value
+    """
+    if info['current_price'] is None:
+        return
+    if len(_stock_info_cache) >= _STOCK_INFO_CACHE_MAX_SIZE:
+        _stock_info_cache.clear()
+    _stock_info_cache[symbol] = (now + _STOCK_INFO_CACHE_TTL_SECONDS, info)
+
+
+def get_cached_stock_infos(symbols: List[str]) -> Tuple[Dict[str, dict], List[str]]:
+    """Look up stock information from the in-process cache only.
+    
+    Never touches the network, so async handlers can serve warm symbols
+    directly and only pass the stale ones to get_stock_infos, which fetches
+    them in bulk and coalesces concurrent lookups.
+    
+    Args:
+        symbols: Stock ticker symbols
         
-        return price
-    except Exception as e:
-        logger.error(f"[PRICE] Error fetching price for {symbol}: {e}", exc_info=True)
-        return None
+    Returns:
+        Tuple of (symbol -> cached stock info, symbols missing or expired)
+    """
+    now = time.monotonic()
+    infos: Dict[str, dict] = {}
+    missing = []
+    
+    for symbol in dict.fromkeys(symbols):
+        cached = _stock_info_cache.get(symbol)
+        if cached is not None and now < cached[0]:
+            infos[symbol] = cached[1]
+        else:
+            missing.append(symbol)
+    
+    return infos, missing
 
 
-def get_stock_info(symbol: str):
+async def get_stock_info_async(symbol: str) -> dict:
     """Get comprehensive stock information from Alpha Vantage.
     
+    Successful lookups are cached per symbol for a short time, so portfolio
+    summaries and the holding write that follows them share one quote fetch.
+    Prices up to 30 seconds old are fine for P&L views. Failed lookups are
+    not cached. Concurrent misses for the same symbol share one upstream
+    request.
+    
     Args:
         symbol: Stock ticker symbol
         
     Returns:
-        Dictionary with price, change, percent, and company name (market cap excluded to reduce API calls)
+        Dictionary with price, change, percent, and company name
     """
-    try:
-        logger.info(f"[INFO] Fetching info for symbol: {symbol}")
-        quote_data = stock_service.get_quote(symbol)
-        
-        if not quote_data:
-            logger.warning(f"[INFO] No data returned for {symbol}")
-            return {
-                'current_price': None,
-                'price_change': None,
-                'change_percent': None,
-                'market_cap': None,
-                'company_name': symbol
-            }
-        
-        current_price = quote_data.get('current_price')
-        change_percent = quote_data.get('daily_change_pct')
-        
-        # Calculate price change from percentage and current price
-        price_change = None
-        if current_price and change_percent:
-            # change_pct is already in percentage form
-            previous_close = current_price / (1 + change_percent / 100)
-            price_change = current_price - previous_close
-        
-        result = {
-            'current_price': current_price,
-            'price_change': price_change,
-            'change_percent': change_percent,
-            'market_cap': None,  # TODO: Cache in DB to reduce API calls
-            'company_name': symbol  # Using symbol for now, can be enhanced with DB cache
-        }
-        
-        logger.info(f"[INFO] {symbol} - Result: {result}")
-        return result
-        
-    except Exception as e:
-        logger.error(f"[INFO] Error fetching info for {symbol}: {e}", exc_info=True)
+    now = time.monotonic()
+    cached = _stock_info_cache.get(symbol)
+    if cached is not None and now < cached[0]:
+        return cached[1]
+    
+    quote_data = await _quote_lookups.run(symbol, lambda: stock_service.get_quote_async(symbol))
+    
+    if not quote_data:
+        logger.warning(f"[INFO] No data returned for {symbol}")
         return {
             'current_price': None,
             'price_change': None,
@@ -114,12 +149,362 @@ def get_stock_info(symbol: str):
             'market_cap': None,
             'company_name': symbol
         }
+    
+    result = _build_stock_info(symbol, quote_data)
+    _cache_stock_info(symbol, result, now)
+    
+    return result
+
+
+async def get_stock_infos(symbols: List[str]) -> Dict[str, dict]:
+    """Get stock information for several symbols with as few API calls as possible.
+    
+    Cached symbols are served directly. The rest are fetched in one
+    Alpha Vantage bulk quote request, and anything the bulk endpoint does not
+    return (for example on a free API key) falls back to concurrent
+    per-symbol lookups. All network I/O is async, and identical concurrent
+    requests are coalesced.
+    
+    Args:
+        symbols: Stock ticker symbols
+        
+    Returns:
+        Dictionary mapping each symbol to its stock info
+    """
+    now = time.monotonic()
+    infos, missing = get_cached_stock_infos(symbols)
+    
+    if not missing:
+        return infos
+    
+    quotes = await _bulk_quote_lookups.run(
+        frozenset(missing),
+        lambda: stock_service.get_quotes_async(missing)
+    )
+    for symbol, quote_data in quotes.items():
+        info = _build_stock_info(symbol, quote_data)
+        _cache_stock_info(symbol, info, now)
+        infos[symbol] = info
+    
+    leftover = [symbol for symbol in missing if symbol not in infos]
+    if leftover:
+        infos.update(zip(leftover, await asyncio.gather(*map(get_stock_info_async, leftover))))
+    
+    return infos
+
+
+async def _read_user(container, user_id: str) -> dict:
+    """Point-read the user document (the user id is also the partition key).
+    
+    Args:
+        container: Async Cosmos DB container
+        user_id: User ID from JWT token (document id)
+        
+    Returns:
+        User document
+        
+    Raises:
+        HTTPException 404: If the user document doesn't exist
+    """
+    try:
+        return await container.read_item(item=user_id, partition_key=user_id)
+    except exceptions.CosmosResourceNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+
+
+async def _read_watchlists(container, user_id: str) -> List[dict]:
+    """Read only the watchlist items of a user document.
+    
+    Args:
+        container: Async Cosmos DB container
+        user_id: User ID from JWT token (document id)
+        
+    Returns:
+        Watchlist items as stored (empty if the user has none)
+        
+    Raises:
+        HTTPException 404: If the user document doesn't exist
+    """
+    items = container.query_items(
+        query=WATCHLIST_QUERY,
+        parameters=[{"name": "@user_id", "value": user_id}],
+        partition_key=user_id,
+        max_item_count=1
+    )
+    async for item in items:
+        return item.get("watchlists") or []
+    
+    raise HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="User not found"
+    )
+
+
+def _find_watchlist_item(watchlists: List[dict], symbol: str) -> Optional[int]:
+    """Find the array index of a watchlist item.
+    
+    Args:
+        watchlists: Watchlist items from the user document
+        symbol: Stock ticker symbol
+        
+    Returns:
+        Index of the item, or None if the symbol is not in the watchlist
+    """
+    for index, item in enumerate(watchlists):
+        if item["symbol"] == symbol:
+            return index
+    return None
+
+
+def _add_item_patch(user_data: dict, symbol: str, notes: Optional[str], added_at: datetime) -> Tuple[list, WatchlistItem]:
+    """Build the patch that appends a stock to the watchlist.
+    
+    Adds stock at the end of the watchlist (highest display_order + 1).
+    
+    Args:
+        user_data: User document
+        symbol: Stock ticker symbol
+        notes: Optional notes
+        added_at: When the item was added
+        
+    Returns:
+        Tuple of (patch operations, new watchlist item)
+        
+    Raises:
+        HTTPException 400: If symbol already in watchlist or limit reached
+    """
+    watchlists = user_data.get("watchlists", [])
+    
+    # Check if symbol already exists
+    if _find_watchlist_item(watchlists, symbol) is not None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Symbol {symbol} already in watchlist"
+        )
+    
+    # Check watchlist size limit
+    if len(watchlists) >= settings.MAX_WATCHLIST_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Watchlist limit reached (max {settings.MAX_WATCHLIST_ITEMS} items)"
+        )
+    
+    # Get next display_order (append to end)
+    next_order = max([item["display_order"] for item in watchlists], default=-1) + 1
+    
+    new_item = WatchlistItem(
+        symbol=symbol,
+        display_order=next_order,
+        notes=notes,
+        added_at=added_at
+    )
+    
+    # Append to watchlists array (convert datetime to ISO string)
+    item_dict = new_item.model_dump(mode='json')
+    if "watchlists" in user_data:
+        operations = [{"op": "add", "path": "/watchlists/-", "value": item_dict}]
+    else:
+        operations = [{"op": "set", "path": "/watchlists", "value": [item_dict]}]
+    return operations, new_item
+
+
+def _reorder_patch(user_data: dict, symbol_order: List[str]) -> Tuple[list, List[dict]]:
+    """Build the patch that sets display_order from a symbol order.
+    
+    Args:
+        user_data: User document
+        symbol_order: Every watchlist symbol, in the new order
+        
+    Returns:
+        Tuple of (patch operations, reordered items sorted by display_order)
+        
+    Raises:
+        HTTPException 400: If symbols don't match user's watchlist
+    """
+    watchlists = user_data.get("watchlists", [])
+    
+    # Create symbol to item mapping
+    item_map = {item["symbol"]: item for item in watchlists}
+    
+    # Validate all symbols exist
+    for symbol in symbol_order:
+        if symbol not in item_map:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Symbol {symbol} not found in watchlist"
+            )
+    
+    # Check if all existing symbols are included
+    if len(symbol_order) != len(watchlists):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Must include all {len(watchlists)} symbols in reorder request"
+        )
+    
+    # Update display orders
+    for index, symbol in enumerate(symbol_order):
+        item_map[symbol]["display_order"] = index
+    
+    # Every item changes, so set the array in one operation
+    operations = [{"op": "set", "path": "/watchlists", "value": watchlists}]
+    return operations, sorted(watchlists, key=lambda x: x["display_order"])
+
+
+def _update_notes_patch(user_data: dict, symbol: str, notes: Optional[str]) -> Tuple[list, dict]:
+    """Build the patch that sets the notes of a watchlist item.
+    
+    Args:
+        user_data: User document
+        symbol: Stock ticker symbol
+        notes: Updated notes
+        
+    Returns:
+        Tuple of (patch operations, updated item)
+        
+    Raises:
+        HTTPException 404: If symbol not found in watchlist
+    """
+    watchlists = user_data.get("watchlists", [])
+    item_index = _find_watchlist_item(watchlists, symbol)
+    
+    if item_index is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Symbol {symbol} not found in watchlist"
+        )
+    
+    item = watchlists[item_index]
+    item["notes"] = notes
+    operations = [{"op": "set", "path": f"/watchlists/{item_index}/notes", "value": notes}]
+    return operations, item
+
+
+def _remove_item_patch(user_data: dict, symbol: str) -> Tuple[list, None]:
+    """Build the patch that removes a watchlist item.
+    
+    Remaining items after the removed one move up to fill the gap.
+    
+    Args:
+        user_data: User document
+        symbol: Stock ticker symbol
+        
+    Returns:
+        Tuple of (patch operations, None)
+        
+    Raises:
+        HTTPException 404: If symbol not found in watchlist
+    """
+    watchlists = user_data.get("watchlists", [])
+    deleted_index = _find_watchlist_item(watchlists, symbol)
+    
+    if deleted_index is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Symbol {symbol} not found in watchlist"
+        )
+    
+    deleted_order = watchlists[deleted_index]["display_order"]
+    updated_watchlists = watchlists[:deleted_index] + watchlists[deleted_index + 1:]
+    
+    # Reorder remaining items (decrement orders after deleted item);
+    # indexes below are positions after the removal
+    operations = [{"op": "remove", "path": f"/watchlists/{deleted_index}"}]
+    for index, item in enumerate(updated_watchlists):
+        if item["display_order"] > deleted_order:
+            item["display_order"] -= 1
+            operations.append(
+                {"op": "set", "path": f"/watchlists/{index}/display_order", "value": item["display_order"]}
+            )
+    
+    # Cosmos DB caps a patch request at PATCH_MAX_OPERATIONS
+    if len(operations) > PATCH_MAX_OPERATIONS:
+        operations = [{"op": "set", "path": "/watchlists", "value": updated_watchlists}]
+    return operations, None
+
+
+async def _patch_watchlists(
+    container,
+    user_id: str,
+    user_data: dict,
+    build_patch: Callable[[dict], Tuple[list, Any]],
+) -> Any:
+    """Apply a partial update to the watchlists of a user document.
+    
+    Patching sends only the changed watchlist entries instead of rewriting
+    the whole user document. The patch is conditioned on the ETag of the
+    read, so a concurrent write fails with 412 instead of being lost. On
+    412 the document is re-read after an exponential backoff and the patch
+    rebuilt, up to PATCH_MAX_ATTEMPTS times.
+    
+    Args:
+        container: Async Cosmos DB container
+        user_id: User document id (also the partition key)
+        user_data: User document as read by the handler
+        build_patch: Builds (operations, result) from a user document
+        
+    Returns:
+        The result from the build_patch call that was applied
+        
+    Raises:
+        HTTPException 409: If the watchlist kept changing on every attempt
+    """
+    for attempt in range(1, PATCH_MAX_ATTEMPTS + 1):
+        operations, result = build_patch(user_data)
+        
+        try:
+            await container.patch_item(
+                item=user_id,
+                partition_key=user_id,
+                patch_operations=operations,
+                etag=user_data["_etag"],
+                match_condition=MatchConditions.IfNotModified
+            )
+            return result
+        except exceptions.CosmosAccessConditionFailedError:
+            logger.info(f"Concurrent watchlist change for user {user_id} (attempt {attempt})")
+        
+        if attempt < PATCH_MAX_ATTEMPTS:
+            await asyncio.sleep(PATCH_RETRY_BASE_DELAY_SECONDS * 2 ** (attempt - 1))
+            user_data = await _read_user(container, user_id)
+    
+    raise HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="Watchlist was modified concurrently, please retry"
+    )
+
+
+def _watchlist_item_response(item: dict, stock_info: dict) -> WatchlistItemResponse:
+    """Combine a stored watchlist item with its stock info.
+    
+    Args:
+        item: Watchlist item from the user document
+        stock_info: Stock info dict for the item's symbol
+        
+    Returns:
+        Watchlist item response
+    """
+    # Skip validation: stock info comes from our own service, and added_at
+    # is stored as an ISO string (parsed here so it serializes as datetime)
+    added_at = item["added_at"]
+    if isinstance(added_at, str):
+        added_at = datetime.fromisoformat(added_at)
+    
+    return WatchlistItemResponse.model_construct(
+        symbol=item["symbol"],
+        display_order=item["display_order"],
+        notes=item.get("notes"),
+        added_at=added_at,
+        **stock_info
+    )
 
 
 @router.get("", response_model=WatchlistResponse)
 async def get_watchlist(
     user_id: str = Depends(get_current_user_id),
-    container = Depends(get_db)
+    container = Depends(get_async_db)
 ):
     """Get user's watchlist ordered by display_order.
     
@@ -128,30 +513,13 @@ async def get_watchlist(
     
     Args:
         user_id: User ID from JWT token (document id)
-        container: Cosmos DB container
+        container: Async Cosmos DB container
         
     Returns:
         Watchlist with items (including current prices), total count, and max limit
     """
-    # Get user document
-    query = "SELECT * FROM c WHERE c.id = @user_id"
-    parameters = [{"name": "@user_id", "value": user_id}]
-    
     try:
-        users = list(container.query_items(
-            query=query,
-            parameters=parameters,
-            enable_cross_partition_query=True
-        ))
-        
-        if not users:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User not found"
-            )
-        
-        user_data = users[0]
-        items = user_data.get("watchlists", [])
+        items = await _read_watchlists(container, user_id)
         
         if not items:
             return WatchlistResponse(
@@ -163,25 +531,12 @@ async def get_watchlist(
         # Sort by display_order
         items.sort(key=lambda x: x.get("display_order", 0))
         
-        # Fetch stock info in parallel using thread pool
-        loop = asyncio.get_event_loop()
-        
-        async def fetch_stock_info_async(item):
-            """Fetch stock info asynchronously in thread pool."""
-            stock_info = await loop.run_in_executor(executor, get_stock_info, item["symbol"])
-            item_response = {
-                "symbol": item["symbol"],
-                "display_order": item["display_order"],
-                "notes": item.get("notes"),
-                "added_at": item["added_at"]
-            }
-            item_response.update(stock_info)
-            return WatchlistItemResponse(**item_response)
-        
-        # Fetch all stock info concurrently
-        items_with_info = await asyncio.gather(*[
-            fetch_stock_info_async(item) for item in items
-        ])
+        # One batched quote lookup for the whole watchlist
+        symbol_to_info = await get_stock_infos([item["symbol"] for item in items])
+        items_with_info = [
+            _watchlist_item_response(item, symbol_to_info[item["symbol"]])
+            for item in items
+        ]
         
         return WatchlistResponse(
             items=items_with_info,
@@ -201,7 +556,8 @@ async def get_watchlist(
 async def add_to_watchlist(
     request: WatchlistAddRequest,
     user_id: str = Depends(get_current_user_id),
-    container = Depends(get_db)
+    container = Depends(get_async_db),
+    now: datetime = Depends(now_utc)
 ):
     """Add a stock to user's watchlist.
     
@@ -211,7 +567,8 @@ async def add_to_watchlist(
     Args:
         request: Stock symbol and optional notes
         user_id: User ID from JWT token (document id)
-        container: Cosmos DB container
+        container: Async Cosmos DB container
+        now: Request timestamp, stored as added_at
         
     Returns:
         Created watchlist item
@@ -219,59 +576,14 @@ async def add_to_watchlist(
     Raises:
         HTTPException 400: If symbol already in watchlist or limit reached
     """
-    # Get user document
-    query = "SELECT * FROM c WHERE c.id = @user_id"
-    parameters = [{"name": "@user_id", "value": user_id}]
-    
     try:
-        users = list(container.query_items(
-            query=query,
-            parameters=parameters,
-            enable_cross_partition_query=True
-        ))
-        
-        if not users:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User not found"
-            )
-        
-        user_data = users[0]
-        watchlists = user_data.get("watchlists", [])
-        
-        # Check if symbol already exists
-        if any(item["symbol"] == request.symbol for item in watchlists):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Symbol {request.symbol} already in watchlist"
-            )
+        user_data = await _read_user(container, user_id)
         
-        # Check watchlist size limit
-        if len(watchlists) >= settings.MAX_WATCHLIST_ITEMS:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Watchlist limit reached (max {settings.MAX_WATCHLIST_ITEMS} items)"
-            )
-        
-        # Get next display_order (append to end)
-        next_order = max([item["display_order"] for item in watchlists], default=-1) + 1
-        
-        # Create watchlist item
-        new_item = WatchlistItem(
-            symbol=request.symbol,
-            display_order=next_order,
-            notes=request.notes,
-            added_at=datetime.utcnow()
-        )
-        
-        # Add to watchlists array (convert datetime to ISO string)
-        watchlists.append(new_item.model_dump(mode='json'))
-        user_data["watchlists"] = watchlists
-        
-        # Update document
-        updated_user = container.replace_item(
-            item=user_data["id"],
-            body=user_data
+        new_item = await _patch_watchlists(
+            container,
+            user_id,
+            user_data,
+            lambda doc: _add_item_patch(doc, request.symbol, request.notes, now)
         )
         
         logger.info(f"Added {request.symbol} to watchlist for user {user_id}")
@@ -283,7 +595,7 @@ async def add_to_watchlist(
             "notes": new_item.notes,
             "added_at": new_item.added_at
         }
-        stock_info = get_stock_info(new_item.symbol)
+        stock_info = await get_stock_info_async(new_item.symbol)
         item_response.update(stock_info)
         
         return WatchlistItemResponse(**item_response)
@@ -302,7 +614,7 @@ async def add_to_watchlist(
 async def reorder_watchlist(
     request: WatchlistReorderRequest,
     user_id: str = Depends(get_current_user_id),
-    container = Depends(get_db)
+    container = Depends(get_async_db)
 ):
     """Reorder watchlist items.
     
@@ -312,7 +624,7 @@ async def reorder_watchlist(
     Args:
         request: Ordered list of symbols
         user_id: User ID from JWT token (document id)
-        container: Cosmos DB container
+        container: Async Cosmos DB container
         
     Returns:
         Updated watchlist with new order
@@ -320,71 +632,24 @@ async def reorder_watchlist(
     Raises:
         HTTPException 400: If symbols don't match user's watchlist
     """
-    # Get user document
-    query = "SELECT * FROM c WHERE c.id = @user_id"
-    parameters = [{"name": "@user_id", "value": user_id}]
-    
     try:
-        users = list(container.query_items(
-            query=query,
-            parameters=parameters,
-            enable_cross_partition_query=True
-        ))
-        
-        if not users:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User not found"
-            )
-        
-        user_data = users[0]
-        watchlists = user_data.get("watchlists", [])
-        
-        # Create symbol to item mapping
-        item_map = {item["symbol"]: item for item in watchlists}
+        user_data = await _read_user(container, user_id)
         
-        # Validate all symbols exist
-        for symbol in request.symbol_order:
-            if symbol not in item_map:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Symbol {symbol} not found in watchlist"
-                )
-        
-        # Check if all existing symbols are included
-        if len(request.symbol_order) != len(watchlists):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Must include all {len(watchlists)} symbols in reorder request"
-            )
-        
-        # Update display orders
-        for index, symbol in enumerate(request.symbol_order):
-            item_map[symbol]["display_order"] = index
-        
-        # Update document
-        user_data["watchlists"] = list(item_map.values())
-        updated_user = container.replace_item(
-            item=user_data["id"],
-            body=user_data
+        updated_watchlists = await _patch_watchlists(
+            container,
+            user_id,
+            user_data,
+            lambda doc: _reorder_patch(doc, request.symbol_order)
         )
         
         logger.info(f"Reordered watchlist for user {user_id}")
         
         # Return updated watchlist with stock info (sorted by display_order)
-        updated_watchlists = sorted(updated_user.get("watchlists", []), key=lambda x: x["display_order"])
-        
-        items_with_info = []
-        for item in updated_watchlists:
-            item_response = {
-                "symbol": item["symbol"],
-                "display_order": item["display_order"],
-                "notes": item.get("notes"),
-                "added_at": item["added_at"]
-            }
-            stock_info = get_stock_info(item["symbol"])
-            item_response.update(stock_info)
-            items_with_info.append(WatchlistItemResponse(**item_response))
+        symbol_to_info = await get_stock_infos([item["symbol"] for item in updated_watchlists])
+        items_with_info = [
+            _watchlist_item_response(item, symbol_to_info[item["symbol"]])
+            for item in updated_watchlists
+        ]
         
         return WatchlistResponse(
             items=items_with_info,
@@ -407,7 +672,7 @@ async def update_watchlist_item(
     symbol: str,
     request: WatchlistUpdateRequest,
     user_id: str = Depends(get_current_user_id),
-    container = Depends(get_db)
+    container = Depends(get_async_db)
 ):
     """Update notes for a watchlist item.
     
@@ -415,7 +680,7 @@ async def update_watchlist_item(
         symbol: Stock ticker symbol
         request: Updated notes
         user_id: User ID from JWT token (document id)
-        container: Cosmos DB container
+        container: Async Cosmos DB container
         
     Returns:
         Updated watchlist item
@@ -425,45 +690,14 @@ async def update_watchlist_item(
     """
     symbol = symbol.upper()
     
-    # Get user document
-    query = "SELECT * FROM c WHERE c.id = @user_id"
-    parameters = [{"name": "@user_id", "value": user_id}]
-    
     try:
-        users = list(container.query_items(
-            query=query,
-            parameters=parameters,
-            enable_cross_partition_query=True
-        ))
-        
-        if not users:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User not found"
-            )
-        
-        user_data = users[0]
-        watchlists = user_data.get("watchlists", [])
-        
-        # Find item by symbol
-        item_found = None
-        for item in watchlists:
-            if item["symbol"] == symbol:
-                item["notes"] = request.notes
-                item_found = item
-                break
-        
-        if not item_found:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Symbol {symbol} not found in watchlist"
-            )
+        user_data = await _read_user(container, user_id)
         
-        # Update document
-        user_data["watchlists"] = watchlists
-        updated_user = container.replace_item(
-            item=user_data["id"],
-            body=user_data
+        item_found = await _patch_watchlists(
+            container,
+            user_id,
+            user_data,
+            lambda doc: _update_notes_patch(doc, symbol, request.notes)
         )
         
         logger.info(f"Updated notes for {symbol} in user {user_id} watchlist")
@@ -494,7 +728,7 @@ async def update_watchlist_item(
 async def remove_from_watchlist(
     symbol: str,
     user_id: str = Depends(get_current_user_id),
-    container = Depends(get_db)
+    container = Depends(get_async_db)
 ):
     """Remove a stock from user's watchlist.
     
@@ -503,59 +737,21 @@ async def remove_from_watchlist(
     Args:
         symbol: Stock ticker symbol
         user_id: User ID from JWT token (document id)
-        container: Cosmos DB container
+        container: Async Cosmos DB container
         
     Raises:
         HTTPException 404: If symbol not found in watchlist
     """
     symbol = symbol.upper()
     
-    # Get user document
-    query = "SELECT * FROM c WHERE c.id = @user_id"
-    parameters = [{"name": "@user_id", "value": user_id}]
-    
     try:
-        users = list(container.query_items(
-            query=query,
-            parameters=parameters,
-            enable_cross_partition_query=True
-        ))
-        
-        if not users:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User not found"
-            )
-        
-        user_data = users[0]
-        watchlists = user_data.get("watchlists", [])
-        
-        # Find and remove item by symbol
-        deleted_order = None
-        updated_watchlists = []
-        
-        for item in watchlists:
-            if item["symbol"] == symbol:
-                deleted_order = item["display_order"]
-            else:
-                updated_watchlists.append(item)
-        
-        if deleted_order is None:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Symbol {symbol} not found in watchlist"
-            )
-        
-        # Reorder remaining items (decrement orders after deleted item)
-        for item in updated_watchlists:
-            if item["display_order"] > deleted_order:
-                item["display_order"] -= 1
+        user_data = await _read_user(container, user_id)
         
-        # Update document
-        user_data["watchlists"] = updated_watchlists
-        container.replace_item(
-            item=user_data["id"],
-            body=user_data
+        await _patch_watchlists(
+            container,
+            user_id,
+            user_data,
+            lambda doc: _remove_item_patch(doc, symbol)
         )
         
         logger.info(f"Removed {symbol} from user {user_id} watchlist")
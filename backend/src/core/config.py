@@ -36,7 +36,12 @@ class Settings(BaseSettings):
     COSMOS_ENDPOINT: str
     COSMOS_KEY: str
     COSMOS_DATABASE_NAME: str = "mystockdb"
-    COSMOS_CONTAINER_NAME: str = "users"
+    COSMOS_CONTAINER_NAME: str = "users_by_id"  # partitioned by /id (hash of the email)
+    # Pre-migration container partitioned by /email; documents still there are
+    # re-keyed on first use. Set to "" once migrate_users.py has run.
+    COSMOS_LEGACY_CONTAINER_NAME: str = "users"
+    COSMOS_POOL_SIZE: int = 20  # keep-alive connections held per host
+    COSMOS_MAX_OVERFLOW: int = 20  # extra connections allowed under bursts
     
     # Security Settings
     # Use JWT_SECRET env var if available, otherwise SECRET_KEY, otherwise generate random
@@ -78,6 +83,20 @@ class Settings(BaseSettings):
     
     # Rate Limiting
     RATE_LIMIT_PER_MINUTE: int = 60
+    LOGIN_RATE_LIMIT_PER_MINUTE: int = 10  # per client IP
+    LOGIN_ACCOUNT_RATE_LIMIT_PER_MINUTE: int = 100  # per email across all clients
+    
+    # Reverse proxies whose X-Forwarded-For header is trusted (IPs, or * for any peer).
+    # Empty means clients connect directly and the socket peer is the client.
+    TRUSTED_PROXY_IPS: Union[List[str], str] = ""
+    
+    @field_validator("TRUSTED_PROXY_IPS", mode="before")
+    @classmethod
+    def parse_trusted_proxy_ips(cls, v):
+        """Parse TRUSTED_PROXY_IPS from comma-separated string or list."""
+        if isinstance(v, str):
+            return [ip.strip() for ip in v.split(",") if ip.strip()]
+        return v
     
     # Pagination
     MAX_PAGE_SIZE: int = 100
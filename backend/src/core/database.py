@@ -5,7 +5,10 @@ for all database operations.
 """
 
 from azure.cosmos import CosmosClient, PartitionKey, exceptions
+from azure.cosmos.aio import CosmosClient as AsyncCosmosClient
+from azure.core.pipeline.transport import AioHttpTransport
 from typing import Optional
+import aiohttp
 import logging
 from .config import settings
 
@@ -17,6 +20,23 @@ _database = None
 _container = None
 _top_movers_container = None
 
+# Global async Cosmos client instance (used by endpoints that await I/O)
+_async_cosmos_client: Optional[AsyncCosmosClient] = None
+_async_container = None
+_async_legacy_container = None
+_async_http_session: Optional[aiohttp.ClientSession] = None
+
+
+def _connection_verify() -> bool:
+    """Return whether SSL should be verified for the configured endpoint.
+    
+    The local emulator (localhost) uses a self-signed certificate.
+    """
+    if "localhost" in settings.COSMOS_ENDPOINT or "127.0.0.1" in settings.COSMOS_ENDPOINT:
+        logger.warning("Detected localhost endpoint - disabling SSL verification for emulator")
+        return False
+    return True
+
 
 def get_cosmos_client() -> CosmosClient:
     """Get or create Cosmos DB client singleton.
@@ -29,21 +49,44 @@ def get_cosmos_client() -> CosmosClient:
     if _cosmos_client is None:
         logger.info(f"Creating Cosmos DB client for endpoint: {settings.COSMOS_ENDPOINT}")
         
-        # For local emulator (localhost), disable SSL verification
-        connection_verify = True
-        if "localhost" in settings.COSMOS_ENDPOINT or "127.0.0.1" in settings.COSMOS_ENDPOINT:
-            logger.warning("Detected localhost endpoint - disabling SSL verification for emulator")
-            connection_verify = False
-        
         _cosmos_client = CosmosClient(
             url=settings.COSMOS_ENDPOINT,
             credential=settings.COSMOS_KEY,
-            connection_verify=connection_verify
+            connection_verify=_connection_verify()
         )
     
     return _cosmos_client
 
 
+def get_async_cosmos_client() -> AsyncCosmosClient:
+    """Get or create the async Cosmos DB client singleton.
+    
+    Returns:
+        AsyncCosmosClient: Azure Cosmos DB asyncio client instance
+    """
+    global _async_cosmos_client, _async_http_session
+    
+    if _async_cosmos_client is None:
+        logger.info(f"Creating async Cosmos DB client for endpoint: {settings.COSMOS_ENDPOINT}")
+        
+        # Explicitly sized connection pool shared by all concurrent requests
+        pool_size = settings.COSMOS_POOL_SIZE + settings.COSMOS_MAX_OVERFLOW
+        _async_http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=pool_size, limit_per_host=pool_size, ttl_dns_cache=300),
+            cookie_jar=aiohttp.DummyCookieJar(),
+            auto_decompress=False
+        )
+        
+        _async_cosmos_client = AsyncCosmosClient(
+            url=settings.COSMOS_ENDPOINT,
+            credential=settings.COSMOS_KEY,
+            connection_verify=_connection_verify(),
+            transport=AioHttpTransport(session=_async_http_session, session_owner=False)
+        )
+    
+    return _async_cosmos_client
+
+
 def get_database():
     """Get or create Cosmos DB database instance.
     
@@ -76,6 +119,42 @@ def get_container():
     return _container
 
 
+def get_async_container():
+    """Get or create async Cosmos DB container instance.
+    
+    Returns:
+        azure.cosmos.aio.ContainerProxy: Async container instance for users
+    """
+    global _async_container
+    
+    if _async_container is None:
+        database = get_async_cosmos_client().get_database_client(settings.COSMOS_DATABASE_NAME)
+        _async_container = database.get_container_client(settings.COSMOS_CONTAINER_NAME)
+        logger.info(f"Connected to async container: {settings.COSMOS_CONTAINER_NAME}")
+    
+    return _async_container
+
+
+def get_async_legacy_container():
+    """Get the async container for users not yet migrated to /id partitioning.
+    
+    Returns:
+        azure.cosmos.aio.ContainerProxy: Async container partitioned by /email,
+        or None once COSMOS_LEGACY_CONTAINER_NAME is cleared after migration
+    """
+    global _async_legacy_container
+    
+    if not settings.COSMOS_LEGACY_CONTAINER_NAME:
+        return None
+    
+    if _async_legacy_container is None:
+        database = get_async_cosmos_client().get_database_client(settings.COSMOS_DATABASE_NAME)
+        _async_legacy_container = database.get_container_client(settings.COSMOS_LEGACY_CONTAINER_NAME)
+        logger.info(f"Connected to legacy async container: {settings.COSMOS_LEGACY_CONTAINER_NAME}")
+    
+    return _async_legacy_container
+
+
 def get_top_movers_container():
     """Get or create Cosmos DB container instance for top movers data.
     
@@ -109,14 +188,17 @@ def initialize_cosmos_db():
         raise
     
     # Create container if it doesn't exist
-    # Partition key: /email (each user is a separate partition)
+    # Partition key: /id (id is a hash of the email, so each user is a separate
+    # partition and every lookup by id or email can be a point read).
+    # The legacy /email container is left as is; a partition key can't be
+    # changed in place, so documents are copied over by migrate_users.py.
     try:
         container = database.create_container_if_not_exists(
             id=settings.COSMOS_CONTAINER_NAME,
-            partition_key=PartitionKey(path="/email"),
+            partition_key=PartitionKey(path="/id"),
             offer_throughput=400  # 400 RU/s (minimum for production)
         )
-        logger.info(f"Container ready: {settings.COSMOS_CONTAINER_NAME} with partition key /email")
+        logger.info(f"Container ready: {settings.COSMOS_CONTAINER_NAME} with partition key /id")
     except exceptions.CosmosHttpResponseError as e:
         logger.error(f"Error creating container: {e}")
         raise
@@ -154,6 +236,25 @@ def close_cosmos_client():
         logger.info("Cosmos DB client closed")
 
 
+async def close_async_cosmos_client():
+    """Close the async Cosmos DB client and its HTTP session.
+    
+    Should be called during application shutdown.
+    """
+    global _async_cosmos_client, _async_container, _async_legacy_container, _async_http_session
+    
+    if _async_cosmos_client is not None:
+        await _async_cosmos_client.close()
+        _async_cosmos_client = None
+        _async_container = None
+        _async_legacy_container = None
+        logger.info("Async Cosmos DB client closed")
+    
+    if _async_http_session is not None:
+        await _async_http_session.close()
+        _async_http_session = None
+
+
 # Dependency function for FastAPI (replaces get_db)
 def get_db():
     """Dependency function to get Cosmos DB container.
@@ -173,3 +274,22 @@ def get_db():
     except Exception as e:
         logger.error(f"Error getting container: {e}")
         raise
+
+
+async def get_async_db():
+    """Dependency function to get the async Cosmos DB container.
+    
+    Yields:
+        azure.cosmos.aio.ContainerProxy: Async container instance
+        
+    Example:
+        @app.get("/users/{user_id}")
+        async def get_user(user_id: str, container = Depends(get_async_db)):
+            return await container.read_item(item=user_id, partition_key=user_id)
+    """
+    try:
+        container = get_async_container()
+        yield container
+    except Exception as e:
+        logger.error(f"Error getting async container: {e}")
+        raise
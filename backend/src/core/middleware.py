@@ -3,10 +3,15 @@
 Provides authentication middleware for protected routes.
 """
 
+from collections import deque
+from datetime import datetime, timezone
 from fastapi import Request, HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from typing import Optional
+from typing import Deque, Dict, Optional
+import time
+from src.core.config import settings
 from src.core.security import get_user_id_from_token
+from src.core.user_keys import is_legacy_user_id, resolve_legacy_user_id
 
 
 # HTTP Bearer token security scheme
@@ -18,6 +23,9 @@ async def get_current_user_id(
 ) -> str:
     """Extract and validate user ID from JWT token.
     
+    Tokens issued before user ids became email hashes carry the old uuid;
+    those are mapped to the current document id.
+    
     Args:
         credentials: HTTP Authorization credentials
         
@@ -44,9 +52,25 @@ async def get_current_user_id(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    if is_legacy_user_id(user_id):
+        user_id = await resolve_legacy_user_id(user_id) or user_id
+    
     return user_id
 
 
+async def now_utc() -> datetime:
+    """Get the current UTC time, resolved once per request.
+    
+    FastAPI caches dependency results per request, so every Depends(now_utc)
+    in one request sees the same timestamp. The value is naive, matching the
+    UTC timestamps already stored in Cosmos DB.
+    
+    Returns:
+        Current UTC time (naive)
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
 async def get_optional_user_id(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False))
 ) -> Optional[str]:
@@ -63,3 +87,84 @@ async def get_optional_user_id(
     
     token = credentials.credentials
     return get_user_id_from_token(token)
+
+
+def _strip_port(address: str) -> str:
+    """Drop a port suffix from an address ("1.2.3.4:5678", "[::1]:5678")."""
+    if address.startswith("["):
+        return address[1:address.find("]")]
+    if address.count(":") == 1:
+        return address.split(":", 1)[0]
+    return address
+
+
+def get_client_ip(request: Request) -> str:
+    """Resolve the address of the client that originated a request.
+    
+    X-Forwarded-For is only read when the socket peer is one of
+    settings.TRUSTED_PROXY_IPS ("*" trusts any peer). Entries are walked from
+    the right, skipping listed proxies, so the result is the address the
+    outermost trusted proxy saw; anything a client writes into the header
+    itself is ignored.
+    
+    Args:
+        request: Incoming request
+        
+    Returns:
+        Client IP address, or "unknown" if the peer address is unavailable
+    """
+    trusted = settings.TRUSTED_PROXY_IPS
+    client_ip = request.client.host if request.client else "unknown"
+    if "*" not in trusted and client_ip not in trusted:
+        return client_ip
+    
+    forwarded_for = request.headers.get("x-forwarded-for", "")
+    for entry in reversed(forwarded_for.split(",")):
+        address = _strip_port(entry.strip())
+        if not address:
+            continue
+        client_ip = address
+        if address not in trusted:
+            break
+    
+    return client_ip
+
+
+class SlidingWindowRateLimiter:
+    """In-process sliding-window rate limiter keyed by an arbitrary string.
+    
+    Each key may record at most max_requests hits per period seconds. State is
+    per worker process, which is enough to bound CPU spent on abusive traffic.
+    """
+    
+    def __init__(self, max_requests: int, period: float = 60.0, max_keys: int = 10_000):
+        self.max_requests = max_requests
+        self.period = period
+        self.max_keys = max_keys
+        self._hits: Dict[str, Deque[float]] = {}
+    
+    def hit(self, key: str) -> bool:
+        """Record a request for key.
+        
+        Args:
+            key: Rate limit bucket (e.g. client IP)
+            
+        Returns:
+            True if the request is allowed, False if the key is over its limit
+        """
+        now = time.monotonic()
+        
+        hits = self._hits.get(key)
+        if hits is None:
+            if len(self._hits) >= self.max_keys:
+                self._hits.clear()
+            hits = self._hits[key] = deque()
+        
+        while hits and now - hits[0] >= self.period:
+            hits.popleft()
+        
+        if len(hits) >= self.max_requests:
+            return False
+        
+        hits.append(now)
+        return True
@@ -0,0 +1,45 @@
+"""Profit and loss calculations for portfolio holdings.
+
+Vectorized float64 kernels shared by the portfolio endpoints; callers convert
+results to Decimal only when building responses.
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+
+def compute_pnl(
+    quantities: np.ndarray,
+    avg_prices: np.ndarray,
+    current_prices: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, float, float]:
+    """Compute per-holding and total P&L in a single vectorized pass.
+    
+    Holdings without a current price (0.0) are valued at cost, so their
+    profit/loss and return rate are 0.
+    
+    Args:
+        quantities: Number of shares per holding
+        avg_prices: Average purchase price per holding
+        current_prices: Current market price per holding, 0.0 if unknown
+        
+    Returns:
+        Tuple of (cost bases, current values, profit/losses, return rates in
+        percent, total cost basis, total current value)
+    """
+    cost_bases = quantities * avg_prices
+    current_values = np.where(current_prices != 0, quantities * current_prices, cost_bases)
+    profit_losses = current_values - cost_bases
+    
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return_rates = np.where(cost_bases > 0, profit_losses / cost_bases * 100, 0.0)
+    
+    return (
+        cost_bases,
+        current_values,
+        profit_losses,
+        return_rates,
+        float(cost_bases.sum()),
+        float(current_values.sum()),
+    )
@@ -1,23 +1,85 @@
 """Security utilities for authentication and password hashing.
 
-Provides JWT token generation/verification and bcrypt password hashing.
+Provides JWT token generation/verification and Argon2id password hashing.
 """
 
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+import asyncio
+import hmac
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Optional, Dict, Any, Tuple
 from passlib.context import CryptContext
-from jose import JWTError, jwt
+import jwt
+from jwt.algorithms import HMACAlgorithm
 from src.core.config import settings
 
 
-# Password hashing context using bcrypt
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing context: new hashes use Argon2id (cost tuned for interactive
+# logins); existing bcrypt hashes still verify
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__type="ID",
+    argon2__time_cost=2,
+    argon2__memory_cost=19456,
+    argon2__parallelism=1,
+)
 
+# Dedicated pool for CPU-bound password hashing, one worker per core, so hashes
+# never queue behind other blocking work in the event loop's default executor
+_password_pool = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix="password")
 
-def hash_password(password: str) -> str:
-    """Hash a plain text password using bcrypt.
+# JWT signing key, encoded once instead of on every encode/decode
+_SIGNING_KEY = settings.SECRET_KEY.encode("utf-8")
+
+# Access token lifetime, computed once from settings
+ACCESS_TOKEN_TTL = timedelta(hours=settings.ACCESS_TOKEN_EXPIRE_HOURS)
+ACCESS_TOKEN_TTL_SECONDS = int(ACCESS_TOKEN_TTL.total_seconds())
+
+# Decoded token payloads keyed by raw token: token -> (cached_until, payload)
+_TOKEN_CACHE_TTL_SECONDS = 60
+_TOKEN_CACHE_MAX_SIZE = 2048
+_token_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
+
+class _PrekeyedHMACAlgorithm(HMACAlgorithm):
+    """HMAC algorithm that keys the MAC for the app secret once.
     
-    bcrypt has a 72-byte limit, so we truncate the password if necessary.
+    Signing and verifying with the app secret copy the pre-keyed MAC instead of
+    re-deriving the inner/outer key pads for every token.
+    """
+    
+    def __init__(self, hash_alg):
+        super().__init__(hash_alg)
+        self._keyed_mac = hmac.new(_SIGNING_KEY, digestmod=hash_alg)
+    
+    def sign(self, msg: bytes, key: bytes) -> bytes:
+        if key != _SIGNING_KEY:
+            return super().sign(msg, key)
+        mac = self._keyed_mac.copy()
+        mac.update(msg)
+        return mac.digest()
+
+
+# Private JWS instance for app tokens, limited to the configured algorithm.
+# The pre-keyed HMAC is registered only here, never on PyJWT's process-wide
+# registry, so other PyJWT users in the process are unaffected. (PyJWT 2.8's
+# PyJWT class always signs through the global PyJWS, so the exp/iat claims are
+# handled in create_access_token/verify_token instead.)
+_jws = jwt.PyJWS(algorithms=[settings.ALGORITHM])
+if settings.ALGORITHM in ("HS256", "HS384", "HS512"):
+    _jws.unregister_algorithm(settings.ALGORITHM)
+    _jws.register_algorithm(
+        settings.ALGORITHM,
+        _PrekeyedHMACAlgorithm(getattr(HMACAlgorithm, "SHA" + settings.ALGORITHM[2:]))
+    )
+
+
+def hash_password(password: str) -> str:
+    """Hash a plain text password using Argon2id.
     
     Args:
         password: Plain text password
@@ -25,12 +87,6 @@ def hash_password(password: str) -> str:
     Returns:
         Hashed password string
     """
-    # bcrypt can only handle passwords up to 72 bytes
-    # Truncate if necessary to avoid bcrypt error
-    if len(password.encode('utf-8')) > 72:
-        # Safely truncate to 72 characters (not bytes) to avoid encoding issues
-        password = password[:72]
-    
     return pwd_context.hash(password)
 
 
@@ -47,6 +103,33 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+async def ahash_password(password: str) -> str:
+    """Hash a password on the password pool without blocking the event loop.
+    
+    Args:
+        password: Plain text password
+        
+    Returns:
+        Hashed password string
+    """
+    return await asyncio.get_running_loop().run_in_executor(_password_pool, hash_password, password)
+
+
+async def averify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the password pool without blocking the event loop.
+    
+    Args:
+        plain_password: Plain text password to verify
+        hashed_password: Hashed password from database
+        
+    Returns:
+        True if password matches, False otherwise
+    """
+    return await asyncio.get_running_loop().run_in_executor(
+        _password_pool, verify_password, plain_password, hashed_password
+    )
+
+
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token.
     
@@ -58,14 +141,11 @@ def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta]
         Encoded JWT token string
     """
     to_encode = data.copy()
+    now = int(time.time())
     
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(hours=settings.ACCESS_TOKEN_EXPIRE_HOURS)
-    
-    to_encode.update({"exp": expire, "iat": datetime.utcnow()})
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    to_encode.update({"exp": now + int((expires_delta or ACCESS_TOKEN_TTL).total_seconds()), "iat": now})
+    payload = json.dumps(to_encode, separators=(",", ":")).encode("utf-8")
+    encoded_jwt = _jws.encode(payload, _SIGNING_KEY, algorithm=settings.ALGORITHM)
     
     return encoded_jwt
 
@@ -73,17 +153,40 @@ def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta]
 def verify_token(token: str) -> Optional[Dict[str, Any]]:
     """Verify and decode a JWT token.
     
+    Valid payloads are cached for a short time (never past the token's own
+    expiry), so repeated requests with the same token skip the HMAC check.
+    
     Args:
         token: JWT token string
         
     Returns:
         Decoded token payload if valid, None if invalid
     """
+    now = time.time()
+    
+    cached = _token_cache.get(token)
+    if cached is not None:
+        cached_until, payload = cached
+        if now < cached_until:
+            return payload
+        del _token_cache[token]
+    
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        return payload
-    except JWTError:
+        decoded = _jws.decode_complete(token, _SIGNING_KEY, algorithms=[settings.ALGORITHM])
+        payload = json.loads(decoded["payload"])
+    except (jwt.PyJWTError, ValueError):
+        return None
+    
+    # Same expiry rule as jwt.decode; every app token carries exp
+    exp = payload.get("exp") if isinstance(payload, dict) else None
+    if not isinstance(exp, (int, float)) or exp <= now:
         return None
+    
+    if len(_token_cache) >= _TOKEN_CACHE_MAX_SIZE:
+        _token_cache.clear()
+    _token_cache[token] = (min(now + _TOKEN_CACHE_TTL_SECONDS, exp), payload)
+    
+    return payload
 
 
 def get_user_id_from_token(token: str) -> Optional[str]:
@@ -0,0 +1,51 @@
+"""Request coalescing for concurrent identical upstream calls.
+
+When several requests miss a cache for the same key at once, only the first
+one calls the upstream API; the others await the same in-flight task.
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Coalesce concurrent calls for the same key into one in-flight task."""
+    
+    def __init__(self):
+        """Initialize with no calls in flight."""
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+    
+    async def run(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        """Await func() once per key, sharing the result with concurrent callers.
+        
+        The shared task is shielded, so a cancelled caller does not cancel
+        the fetch for the others. The key is released as soon as the task
+        finishes; results are not cached here.
+        
+        Args:
+            key: Identifies identical calls (e.g. a symbol)
+            func: Zero-argument callable returning the awaitable to run
+        
+        Returns:
+            Result of func()
+        """
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(func())
+            self._inflight[key] = future
+            future.add_done_callback(lambda done: self._release(key, done))
+        
+        return await asyncio.shield(future)
+    
+    def _release(self, key: Hashable, future: asyncio.Future) -> None:
+        """Forget a finished task unless a newer one took its key.
+        
+        Args:
+            key: Key the task was registered under
+            future: The finished task
+        """
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
@@ -0,0 +1,192 @@
+"""User document keys and the fallback for documents not yet migrated.
+
+User documents live in a container partitioned by /id, where the id is the
+SHA-256 hash of the normalized email. Older deployments stored them in a
+container partitioned by /email with uuid ids. Until migrate_users.py has
+copied every document, a user missing from the current container is looked
+up in the legacy container and re-keyed on first use. Access tokens issued
+before the move carry the old uuid, so those are mapped to the new id too.
+"""
+
+import hashlib
+import logging
+import re
+from typing import Dict, Optional
+
+from azure.cosmos import exceptions
+
+from src.core.database import get_async_container, get_async_legacy_container
+
+logger = logging.getLogger(__name__)
+
+# Cosmos DB system properties, regenerated when a document is created
+_SYSTEM_FIELDS = ("_rid", "_self", "_etag", "_attachments", "_ts")
+
+_USER_KEY_PATTERN = re.compile(r"[0-9a-f]{64}")
+
+# Old uuid token subjects already resolved: legacy id -> current id
+_LEGACY_IDS_MAX_SIZE = 10_000
+_legacy_ids: Dict[str, str] = {}
+
+
+def email_key(email: str) -> str:
+    """Derive the user document id (and partition key) from an email.
+    
+    Using a deterministic hash lets every auth lookup be a point read
+    instead of a cross-partition query on the email field.
+    
+    Args:
+        email: User email address
+        
+    Returns:
+        SHA-256 hex digest of the normalized email
+    """
+    return hashlib.sha256(email.strip().lower().encode()).hexdigest()
+
+
+def is_legacy_user_id(user_id: str) -> bool:
+    """Check whether a user id predates the email-hash keys.
+    
+    Args:
+        user_id: User id, e.g. a token subject
+        
+    Returns:
+        True for old (uuid) ids
+    """
+    return _USER_KEY_PATTERN.fullmatch(user_id) is None
+
+
+def rekey_user_document(document: dict) -> dict:
+    """Copy a legacy user document under its email-hash id.
+    
+    The old id is kept as legacy_id so tokens issued before the migration
+    can still be mapped to the document.
+    
+    Args:
+        document: User document from the legacy container
+        
+    Returns:
+        Document ready to create in the current container
+    """
+    rekeyed = {key: value for key, value in document.items() if key not in _SYSTEM_FIELDS}
+    rekeyed["id"] = email_key(document["email"])
+    rekeyed["legacy_id"] = document["id"]
+    return rekeyed
+
+
+async def _copy_to_current(container, document: dict) -> str:
+    """Create the re-keyed copy of a legacy document.
+    
+    A copy created meanwhile (by the migration script or a concurrent
+    request) is kept as is, since it may already have newer changes.
+    
+    Args:
+        container: Async container partitioned by /id
+        document: User document from the legacy container
+        
+    Returns:
+        The document's current id
+    """
+    rekeyed = rekey_user_document(document)
+    try:
+        await container.create_item(body=rekeyed)
+        logger.info(f"Re-keyed legacy user document {document['id']}")
+    except exceptions.CosmosResourceExistsError:
+        pass
+    return rekeyed["id"]
+
+
+async def _query_legacy(query: str, parameters: list, **kwargs) -> Optional[dict]:
+    """Return the first match in the legacy container, if it still exists.
+    
+    Args:
+        query: SQL query
+        parameters: Query parameters
+        **kwargs: Extra query_items options (partition key, cross-partition)
+        
+    Returns:
+        Matching document, or None if there is none or no legacy container
+    """
+    legacy_container = get_async_legacy_container()
+    if legacy_container is None:
+        return None
+    
+    try:
+        async for item in legacy_container.query_items(query=query, parameters=parameters, **kwargs):
+            return item
+    except exceptions.CosmosResourceNotFoundError:
+        # Fresh deployments never had the legacy container
+        pass
+    return None
+
+
+async def migrate_legacy_user(container, email: str) -> bool:
+    """Re-key a user registered before the migration, looked up by email.
+    
+    The legacy container is partitioned by /email, so this is a
+    single-partition query.
+    
+    Args:
+        container: Async container partitioned by /id
+        email: Email address from the request
+        
+    Returns:
+        True if a legacy document exists (it is now in the current container)
+    """
+    for candidate in dict.fromkeys((email.strip(), email.strip().lower())):
+        document = await _query_legacy(
+            "SELECT * FROM c WHERE c.email = @email",
+            [{"name": "@email", "value": candidate}],
+            partition_key=candidate
+        )
+        if document is not None:
+            await _copy_to_current(container, document)
+            return True
+    return False
+
+
+async def resolve_legacy_user_id(legacy_id: str) -> Optional[str]:
+    """Map an old uuid user id (from a pre-migration token) to the current id.
+    
+    Only runs while the legacy container is configured; access tokens
+    expire within a day, so old subjects disappear soon after migration.
+    
+    Args:
+        legacy_id: Old document id
+        
+    Returns:
+        Current document id, or None if no such user exists
+    """
+    if legacy_id in _legacy_ids:
+        return _legacy_ids[legacy_id]
+    
+    if get_async_legacy_container() is None:
+        return None
+    
+    container = get_async_container()
+    user_id = None
+    
+    # Already migrated: find the copy by its old id
+    items = container.query_items(
+        query="SELECT VALUE c.id FROM c WHERE c.legacy_id = @legacy_id",
+        parameters=[{"name": "@legacy_id", "value": legacy_id}],
+        enable_cross_partition_query=True
+    )
+    async for item in items:
+        user_id = item
+        break
+    
+    if user_id is None:
+        document = await _query_legacy(
+            "SELECT * FROM c WHERE c.id = @id",
+            [{"name": "@id", "value": legacy_id}],
+            enable_cross_partition_query=True
+        )
+        if document is None:
+            return None
+        user_id = await _copy_to_current(container, document)
+    
+    if len(_legacy_ids) >= _LEGACY_IDS_MAX_SIZE:
+        _legacy_ids.clear()
+    _legacy_ids[legacy_id] = user_id
+    return user_id
@@ -5,12 +5,23 @@ Initializes FastAPI app with CORS middleware, routes, and lifecycle events.
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 import logging
+import os
 
 from src.core.config import settings
-from src.core.database import initialize_cosmos_db, close_cosmos_client
+from src.core.database import (
+    initialize_cosmos_db,
+    close_cosmos_client,
+    close_async_cosmos_client,
+    get_async_container,
+)
 from src.api import api_router
+from src.services.stock_data_service import close_http_session
+from src.api.auth import run_login_flusher, flush_pending_logins
 
 
 # Configure logging
@@ -35,6 +46,16 @@ async def lifespan(app: FastAPI):
     logger.info(f"Debug mode: {settings.DEBUG}")
     logger.info(f"CORS origins: {settings.CORS_ORIGINS}")
     
+    # Size the default executor used by asyncio.to_thread so bursts of
+    # blocking calls don't queue behind a handful of worker threads. The
+    # work is mostly blocking HTTP (quotes), so allow several threads per CPU.
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(
+            max_workers=min(32, (os.cpu_count() or 1) * 5),
+            thread_name_prefix="blocking-io"
+        )
+    )
+    
     # Initialize Cosmos DB
     try:
         initialize_cosmos_db()
@@ -43,12 +64,22 @@ async def lifespan(app: FastAPI):
         logger.error(f"Failed to initialize Cosmos DB: {e}")
         raise
     
+    # Background writer for buffered last_login_at updates
+    login_flusher = asyncio.create_task(run_login_flusher(get_async_container()))
+    
     yield
     
     # Shutdown
     logger.info("Shutting down MyStock API...")
+    login_flusher.cancel()
+    try:
+        await flush_pending_logins(get_async_container())
+    except Exception as e:
+        logger.error(f"Failed to flush last login timestamps: {e}")
     close_cosmos_client()
+    await close_async_cosmos_client()
     logger.info("Cosmos DB connection closed")
+    await close_http_session()
 
 
 # Initialize FastAPI application
@@ -59,6 +90,7 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -97,12 +97,13 @@ class UserDocument(BaseModel):
     """User document model for Cosmos DB NoSQL storage.
     
     This model represents a complete user with embedded watchlists and portfolios.
-    Each user is stored as a single document with partition key = email.
+    Each user is stored as a single document whose id (also the partition key)
+    is the SHA-256 hash of the normalized email.
     
     Attributes:
-        id: Document ID (user UUID or email for simplicity)
-        email: Unique email address (also used as partition key)
-        password_hash: bcrypt hashed password
+        id: Document ID and partition key (SHA-256 hash of the email)
+        email: Unique email address
+        password_hash: Argon2id (or legacy bcrypt) password hash
         created_at: Account creation timestamp
         last_login_at: Last successful login timestamp
         is_active: Soft delete flag
@@ -111,8 +112,8 @@ class UserDocument(BaseModel):
     """
     
     id: str = Field(default_factory=lambda: str(uuid.uuid4()), alias="_id", description="Document ID")
-    email: EmailStr = Field(..., description="User email (partition key)")
-    password_hash: str = Field(..., description="bcrypt hash")
+    email: EmailStr = Field(..., description="User email")
+    password_hash: str = Field(..., description="Argon2id or legacy bcrypt hash")
     created_at: datetime = Field(default_factory=datetime.utcnow, description="Account creation")
     last_login_at: Optional[datetime] = Field(None, description="Last login")
     is_active: bool = Field(True, description="Account active status")
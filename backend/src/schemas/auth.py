@@ -3,36 +3,45 @@
 Request/response models for user registration, login, and profile.
 """
 
-from pydantic import BaseModel, EmailStr, Field, validator
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator
 from typing import Optional
 from datetime import datetime
 import re
 
 
+_UPPERCASE_RE = re.compile(r'[A-Z]')
+_LOWERCASE_RE = re.compile(r'[a-z]')
+_DIGIT_RE = re.compile(r'\d')
+
+
 class UserRegisterRequest(BaseModel):
     """User registration request schema."""
     
     email: EmailStr = Field(..., description="User email address")
     password: str = Field(..., min_length=8, max_length=100, description="Password (8-100 characters)")
     
-    @validator('password')
-    def validate_password_strength(cls, v):
+    @field_validator('password')
+    @classmethod
+    def validate_password_strength(cls, v: str) -> str:
         """Validate password contains uppercase, lowercase, and number."""
-        if not re.search(r'[A-Z]', v):
+        if not _UPPERCASE_RE.search(v):
             raise ValueError('Password must contain at least one uppercase letter')
-        if not re.search(r'[a-z]', v):
+        if not _LOWERCASE_RE.search(v):
             raise ValueError('Password must contain at least one lowercase letter')
-        if not re.search(r'\d', v):
+        if not _DIGIT_RE.search(v):
             raise ValueError('Password must contain at least one number')
         return v
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        extra="forbid",
+        frozen=True,
+        json_schema_extra={
             "example": {
                 "email": "user@example.com",
                 "password": "SecurePass123"
             }
         }
+    )
 
 
 class UserLoginRequest(BaseModel):
@@ -41,13 +50,16 @@ class UserLoginRequest(BaseModel):
     email: EmailStr = Field(..., description="User email address")
     password: str = Field(..., description="User password")
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        extra="forbid",
+        frozen=True,
+        json_schema_extra={
             "example": {
                 "email": "user@example.com",
                 "password": "SecurePass123"
             }
         }
+    )
 
 
 class TokenResponse(BaseModel):
@@ -57,14 +69,15 @@ class TokenResponse(BaseModel):
     token_type: str = Field(default="bearer", description="Token type")
     expires_in: int = Field(..., description="Token expiration time in seconds")
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "access_token": "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9...",
                 "token_type": "bearer",
                 "expires_in": 86400
             }
         }
+    )
 
 
 class UserProfileResponse(BaseModel):
@@ -76,9 +89,9 @@ class UserProfileResponse(BaseModel):
     last_login_at: Optional[datetime] = Field(None, description="Last login timestamp")
     is_active: bool = Field(..., description="Account active status")
     
-    class Config:
-        from_attributes = True
-        json_schema_extra = {
+    model_config = ConfigDict(
+        from_attributes=True,
+        json_schema_extra={
             "example": {
                 "id": 1,
                 "email": "user@example.com",
@@ -87,6 +100,7 @@ class UserProfileResponse(BaseModel):
                 "is_active": True
             }
         }
+    )
 
 
 class UserRegisterResponse(BaseModel):
@@ -96,8 +110,8 @@ class UserRegisterResponse(BaseModel):
     token: TokenResponse
     portfolios_created: list[str] = Field(..., description="List of auto-created portfolio names")
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "user": {
                     "id": 1,
@@ -114,6 +128,7 @@ class UserRegisterResponse(BaseModel):
                 "portfolios_created": ["장기투자", "단타", "정찰병"]
             }
         }
+    )
 
 
 class UserLoginResponse(BaseModel):
@@ -122,8 +137,8 @@ class UserLoginResponse(BaseModel):
     user: UserProfileResponse
     token: TokenResponse
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "user": {
                     "id": 1,
@@ -139,3 +154,4 @@ class UserLoginResponse(BaseModel):
                 }
             }
         }
+    )
@@ -186,6 +186,20 @@ class PortfolioSummary(BaseModel):
         }
 
 
+class PortfolioCostBasisResponse(BaseModel):
+    """Response schema for the cost-basis-only portfolio view.
+    
+    Attributes:
+        portfolio_id: Portfolio ID
+        total_holdings: Number of holdings
+        total_cost_basis: Total investment across all holdings
+    """
+    
+    portfolio_id: str = Field(..., description="Portfolio ID (UUID)", examples=["cab647a5-3d6c-418d-a4d9-214d064ef2a2"])
+    total_holdings: int = Field(..., description="Number of holdings", examples=[5])
+    total_cost_basis: Decimal = Field(..., description="Total investment", examples=[8750.00])
+
+
 class PortfolioSummaryResponse(BaseModel):
     """Response schema for portfolio summary with holdings and calculations.
     
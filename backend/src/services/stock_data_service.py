@@ -4,6 +4,8 @@ Provides functions to fetch stock quotes and candlestick data from Alpha Vantage
 """
 
 import requests
+import aiohttp
+import asyncio
 import os
 from typing import Optional, Dict, Any, List
 from datetime import datetime, timedelta
@@ -16,11 +18,57 @@ from src.schemas.stocks import MarketEnum as Market, MarketStatusEnum as MarketS
 
 logger = logging.getLogger(__name__)
 
+# Shared async HTTP session for quote lookups from async handlers
+_http_session: Optional[aiohttp.ClientSession] = None
+
+
+def get_http_session() -> aiohttp.ClientSession:
+    """Get or create the shared aiohttp session for Alpha Vantage calls.
+    
+    Returns:
+        aiohttp.ClientSession with a pooled connector
+    """
+    global _http_session
+    
+    if _http_session is None or _http_session.closed:
+        _http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=50),
+            timeout=aiohttp.ClientTimeout(total=10)
+        )
+    
+    return _http_session
+
+
+async def close_http_session():
+    """Close the shared aiohttp session (call on application shutdown)."""
+    global _http_session
+    
+    if _http_session is not None:
+        await _http_session.close()
+        _http_session = None
+
 
 class StockDataService:
     """Service for fetching stock data from Alpha Vantage API."""
     
     BASE_URL = "https://www.alphavantage.co/query"
+    BULK_QUOTE_MAX_SYMBOLS = 100
+    
+    # Per-period lookups, built once at import time
+    PERIOD_FUNCTIONS: Dict[Period, tuple[str, Optional[str]]] = {
+        Period.FIVE_MIN: ("TIME_SERIES_INTRADAY", "5min"),
+        Period.ONE_HOUR: ("TIME_SERIES_INTRADAY", "60min"),
+        Period.ONE_DAY: ("TIME_SERIES_DAILY", None),
+        Period.ONE_WEEK: ("TIME_SERIES_WEEKLY", None),
+        Period.ONE_MONTH: ("TIME_SERIES_MONTHLY", None),
+    }
+    PERIOD_MAX_POINTS: Dict[Period, int] = {
+        Period.FIVE_MIN: 100,
+        Period.ONE_HOUR: 100,
+        Period.ONE_DAY: 100,
+        Period.ONE_WEEK: 52,
+        Period.ONE_MONTH: 24,
+    }
     
     def __init__(self):
         """Initialize Alpha Vantage service with API key from environment."""
@@ -67,8 +115,8 @@ class StockDataService:
             return MarketStatus.OPEN
         return MarketStatus.CLOSED
     
-    def get_quote(self, symbol: str) -> Optional[Dict[str, Any]]:
-        """Fetch current stock quote from Alpha Vantage.
+    async def get_quote_async(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Fetch current stock quote from Alpha Vantage over the shared aiohttp session.
         
         Args:
             symbol: Stock ticker symbol (e.g., 'AAPL', 'IBM')
@@ -80,6 +128,7 @@ class StockDataService:
             {
                 'symbol': 'AAPL',
                 'current_price': 175.50,
+                'price_change': 2.17,
                 'daily_change_pct': 1.25,
                 'volume': 50000000,
                 'market_status': 'CLOSED',
@@ -88,79 +137,205 @@ class StockDataService:
             }
         """
         try:
-            converted_symbol = self._convert_symbol(symbol)
-            
-            params = {
-                "function": "GLOBAL_QUOTE",
-                "symbol": converted_symbol,
-                "apikey": self.api_key
-            }
-            
-            # Add entitlement parameter if using delayed data
-            if self.use_delayed:
-                params["entitlement"] = "delayed"
+            params = self._query_params("GLOBAL_QUOTE", symbol=self._convert_symbol(symbol))
             
-            response = requests.get(self.BASE_URL, params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            
-            # Check for API errors
-            if "Error Message" in data:
-                logger.error(f"Alpha Vantage error for {symbol}: {data['Error Message']}")
-                return None
+            async with get_http_session().get(self.BASE_URL, params=params) as response:
+                response.raise_for_status()
+                data = await response.json(content_type=None)
             
-            if "Note" in data:
-                logger.warning(f"Alpha Vantage rate limit for {symbol}: {data['Note']}")
-                return None
+            return self._parse_quote(symbol, data)
             
-            # Handle both realtime and delayed response keys
-            quote = None
-            if "Global Quote" in data:
-                quote = data["Global Quote"]
-            elif "Global Quote - DATA DELAYED BY 15 MINUTES" in data:
-                quote = data["Global Quote - DATA DELAYED BY 15 MINUTES"]
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"Network error fetching quote for {symbol}: {str(e)}")
+            return None
+        except Exception as e:
+            logger.error(f"Error fetching quote for {symbol}: {str(e)}")
+            return None
+    
+    def _query_params(self, function: str, **fields: Any) -> Dict[str, Any]:
+        """Build Alpha Vantage query parameters.
+        
+        Args:
+            function: Alpha Vantage function name
+            **fields: Function-specific parameters (e.g. symbol, tickers)
             
-            if not quote:
-                logger.warning(f"No quote data found for symbol: {symbol}")
-                return None
+        Returns:
+            Query parameters including the API key
+        """
+        params = {"function": function, **fields}
+        
+        # Omitted rather than None when unset (aiohttp rejects None values)
+        if self.api_key:
+            params["apikey"] = self.api_key
+        
+        # Add entitlement parameter if using delayed data
+        if self.use_delayed:
+            params["entitlement"] = "delayed"
+        
+        return params
+    
+    def _parse_quote(self, symbol: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Parse a GLOBAL_QUOTE response.
+        
+        Args:
+            symbol: Requested stock ticker symbol
+            data: Decoded JSON response
             
-            # Determine market (KR or US)
-            market = Market.KR if symbol.endswith(('.KS', '.KQ')) else Market.US
+        Returns:
+            Dictionary with quote data or None if the response has no quote
+        """
+        # Check for API errors
+        if "Error Message" in data:
+            logger.error(f"Alpha Vantage error for {symbol}: {data['Error Message']}")
+            return None
+        
+        if "Note" in data:
+            logger.warning(f"Alpha Vantage rate limit for {symbol}: {data['Note']}")
+            return None
+        
+        # Handle both realtime and delayed response keys
+        quote = None
+        if "Global Quote" in data:
+            quote = data["Global Quote"]
+        elif "Global Quote - DATA DELAYED BY 15 MINUTES" in data:
+            quote = data["Global Quote - DATA DELAYED BY 15 MINUTES"]
+        
+        if not quote:
+            logger.warning(f"No quote data found for symbol: {symbol}")
+            return None
+        
+        # Determine market (KR or US)
+        market = Market.KR if symbol.endswith(('.KS', '.KQ')) else Market.US
+        
+        # Determine market status
+        market_status = self._determine_market_status()
+        
+        # Parse quote data
+        current_price = float(quote.get("05. price", 0))
+        change_pct = float(quote.get("10. change percent", "0").replace("%", ""))
+        volume = int(quote.get("06. volume", 0))
+        previous_close = float(quote.get("08. previous close", current_price))
+        price_change = float(quote.get("09. change", current_price - previous_close))
+        
+        return {
+            'symbol': symbol,
+            'current_price': current_price,
+            'price_change': price_change,
+            'daily_change_pct': round(change_pct, 4),
+            'volume': volume,
+            'market_status': market_status,
+            'market': market,
+            'cache_data': {
+                'regularMarketPrice': current_price,
+                'regularMarketChangePercent': change_pct,
+                'regularMarketVolume': volume,
+                'previousClose': previous_close,
+                'open': quote.get("02. open"),
+                'high': quote.get("03. high"),
+                'low': quote.get("04. low"),
+                'latestTradingDay': quote.get("07. latest trading day"),
+            }
+        }
+    
+    async def get_quotes_async(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Fetch quotes for several symbols with Alpha Vantage bulk requests.
+        
+        Uses REALTIME_BULK_QUOTES, which accepts up to 100 symbols per call,
+        so a whole portfolio costs one HTTP round-trip instead of one per
+        symbol; batches are requested concurrently over the shared aiohttp
+        session. The endpoint requires a premium key; symbols it does not
+        return are simply absent from the result so callers can fall back
+        to get_quote_async.
+        
+        Args:
+            symbols: Stock ticker symbols
             
-            # Determine market status
-            market_status = self._determine_market_status()
+        Returns:
+            Dictionary mapping symbol to quote data in the get_quote_async format
+        """
+        market_status = self._determine_market_status()
+        
+        async def fetch_batch(batch: List[str]) -> Dict[str, Dict[str, Any]]:
+            requested = {self._convert_symbol(symbol): symbol for symbol in batch}
             
-            # Parse quote data
-            current_price = float(quote.get("05. price", 0))
-            change_pct = float(quote.get("10. change percent", "0").replace("%", ""))
-            volume = int(quote.get("06. volume", 0))
-            previous_close = float(quote.get("08. previous close", current_price))
+            try:
+                params = self._query_params("REALTIME_BULK_QUOTES", symbol=",".join(requested))
+                
+                async with get_http_session().get(self.BASE_URL, params=params) as response:
+                    response.raise_for_status()
+                    data = await response.json(content_type=None)
+                
+                return self._parse_bulk_quotes(requested, data, market_status)
+                
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.error(f"Network error fetching bulk quotes: {str(e)}")
+            except Exception as e:
+                logger.error(f"Error fetching bulk quotes: {str(e)}")
+            return {}
+        
+        quotes: Dict[str, Dict[str, Any]] = {}
+        for batch_quotes in await asyncio.gather(*(
+            fetch_batch(symbols[start:start + self.BULK_QUOTE_MAX_SYMBOLS])
+            for start in range(0, len(symbols), self.BULK_QUOTE_MAX_SYMBOLS)
+        )):
+            quotes.update(batch_quotes)
+        
+        return quotes
+    
+    @staticmethod
+    def _parse_bulk_quotes(
+        requested: Dict[str, str],
+        data: Dict[str, Any],
+        market_status: MarketStatus,
+    ) -> Dict[str, Dict[str, Any]]:
+        """Parse a REALTIME_BULK_QUOTES response.
+        
+        Args:
+            requested: Converted symbol -> symbol as requested by the caller
+            data: Decoded JSON response
+            market_status: Market status to attach to every quote
             
-            return {
+        Returns:
+            Dictionary mapping symbol to quote data in the get_quote_async format
+        """
+        rows = data.get("data")
+        if not isinstance(rows, list):
+            logger.warning(f"Bulk quotes unavailable: {data.get('Information') or data.get('Note') or data.get('message')}")
+            return {}
+        
+        quotes: Dict[str, Dict[str, Any]] = {}
+        for row in rows:
+            symbol = requested.get(row.get("symbol"))
+            if symbol is None or not row.get("close"):
+                continue
+            
+            current_price = float(row["close"])
+            change_pct = float(str(row.get("change_percent") or 0).replace("%", ""))
+            volume = int(float(row.get("volume") or 0))
+            previous_close = float(row.get("previous_close") or current_price)
+            price_change = float(row.get("change") or current_price - previous_close)
+            
+            quotes[symbol] = {
                 'symbol': symbol,
                 'current_price': current_price,
+                'price_change': price_change,
                 'daily_change_pct': round(change_pct, 4),
                 'volume': volume,
                 'market_status': market_status,
-                'market': market,
+                'market': Market.KR if symbol.endswith(('.KS', '.KQ')) else Market.US,
                 'cache_data': {
                     'regularMarketPrice': current_price,
                     'regularMarketChangePercent': change_pct,
                     'regularMarketVolume': volume,
                     'previousClose': previous_close,
-                    'open': quote.get("02. open"),
-                    'high': quote.get("03. high"),
-                    'low': quote.get("04. low"),
-                    'latestTradingDay': quote.get("07. latest trading day"),
+                    'open': row.get("open"),
+                    'high': row.get("high"),
+                    'low': row.get("low"),
+                    'latestTradingDay': (row.get("timestamp") or "")[:10] or None,
                 }
             }
-            
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Network error fetching quote for {symbol}: {str(e)}")
-            return None
-        except Exception as e:
-            logger.error(f"Error fetching quote for {symbol}: {str(e)}")
-            return None
+        
+        return quotes
     
     @staticmethod
     def _get_function_and_interval(period: Period) -> tuple[str, Optional[str]]:
@@ -169,14 +344,7 @@ class StockDataService:
         Returns:
             Tuple of (function_name, interval) for Alpha Vantage API
         """
-        mapping = {
-            Period.FIVE_MIN: ("TIME_SERIES_INTRADAY", "5min"),
-            Period.ONE_HOUR: ("TIME_SERIES_INTRADAY", "60min"),
-            Period.ONE_DAY: ("TIME_SERIES_DAILY", None),
-            Period.ONE_WEEK: ("TIME_SERIES_WEEKLY", None),
-            Period.ONE_MONTH: ("TIME_SERIES_MONTHLY", None),
-        }
-        return mapping.get(period, ("TIME_SERIES_DAILY", None))
+        return StockDataService.PERIOD_FUNCTIONS.get(period, ("TIME_SERIES_DAILY", None))
     
     @staticmethod
     def _get_time_series_key(function: str, interval: Optional[str] = None) -> str:
@@ -202,14 +370,7 @@ class StockDataService:
     @staticmethod
     def _get_max_points(period: Period) -> int:
         """Get maximum number of data points to return based on period."""
-        limits = {
-            Period.FIVE_MIN: 100,
-            Period.ONE_HOUR: 100,
-            Period.ONE_DAY: 100,
-            Period.ONE_WEEK: 52,
-            Period.ONE_MONTH: 24,
-        }
-        return limits.get(period, 100)
+        return StockDataService.PERIOD_MAX_POINTS.get(period, 100)
     
     def get_candlestick_data(
         self, 
@@ -403,8 +564,8 @@ class StockDataService:
             logger.error(f"Error searching symbols for '{keywords}': {str(e)}")
             return []
     
-    def get_news(self, symbol: str, limit: int = 10) -> List[Dict[str, Any]]:
-        """Fetch recent news articles for a stock from Alpha Vantage.
+    async def get_news_async(self, symbol: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Fetch recent news articles for a stock over the shared aiohttp session.
         
         Args:
             symbol: Stock ticker symbol (e.g., 'AAPL', 'IBM')
@@ -429,107 +590,125 @@ class StockDataService:
         try:
             logger.info(f"Fetching {limit} news articles for symbol: {symbol}")
             
-            converted_symbol = self._convert_symbol(symbol)
-            
-            params = {
-                "function": "NEWS_SENTIMENT",
-                "tickers": converted_symbol,
-                "limit": min(limit, 50),  # Alpha Vantage max is 50
-                "apikey": self.api_key
-            }
-            
-            # Add entitlement parameter if using delayed data
-            if self.use_delayed:
-                params["entitlement"] = "delayed"
-            
-            response = requests.get(self.BASE_URL, params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            
-            # Check for API errors
-            if "Error Message" in data:
-                logger.error(f"Alpha Vantage error for {symbol}: {data['Error Message']}")
-                return []
-            
-            if "Note" in data:
-                logger.warning(f"Alpha Vantage rate limit for {symbol}: {data['Note']}")
-                return []
-            
-            if "feed" not in data or not data["feed"]:
-                logger.warning(f"No news found for symbol: {symbol}")
-                return []
-            
-            logger.info(f"Retrieved {len(data['feed'])} news items from Alpha Vantage for {symbol}")
-            
-            # Convert news data to structured format
-            news_items = []
-            for idx, item in enumerate(data["feed"]):
-                try:
-                    title = item.get('title', '')
-                    summary = item.get('summary', '')
-                    source = item.get('source', 'Unknown')
-                    url = item.get('url', '#')
-                    banner_image = item.get('banner_image')
-                    time_published = item.get('time_published', '')
-                    
-                    # Skip if title is missing
-                    if not title:
-                        logger.warning(f"Skipping news item {idx}: missing title")
-                        continue
-                    
-                    # Parse timestamp: Alpha Vantage format "20250120T011450"
-                    published_at = None
-                    if time_published:
-                        try:
-                            published_at = datetime.strptime(time_published, "%Y%m%dT%H%M%S")
-                        except (ValueError, TypeError) as e:
-                            logger.warning(f"Failed to parse timestamp '{time_published}': {e}")
-                            published_at = datetime.now()
-                    else:
-                        published_at = datetime.now()
-                    
-                    # Extract sentiment for the specific ticker
-                    sentiment_score = None
-                    sentiment_label = None
-                    if 'ticker_sentiment' in item:
-                        for sentiment in item['ticker_sentiment']:
-                            if sentiment.get('ticker', '').upper() == symbol.upper():
-                                sentiment_score = sentiment.get('ticker_sentiment_score')
-                                sentiment_label = sentiment.get('ticker_sentiment_label')
-                                break
-                    
-                    news_item = {
-                        'title': title,
-                        'summary': summary if summary else '',
-                        'publisher': source,
-                        'link': url,
-                        'thumbnail_url': banner_image,
-                        'published_at': published_at,
-                        'sentiment_score': sentiment_score,
-                        'sentiment_label': sentiment_label,
-                    }
-                    news_items.append(news_item)
-                    
-                except Exception as item_error:
-                    logger.error(f"Failed to process news item {idx} for {symbol}: {item_error}")
-                    continue
-            
-            # Sort by published_at in descending order (newest first)
-            news_items.sort(key=lambda x: x['published_at'], reverse=True)
+            params = self._news_params(symbol, limit)
             
-            # Limit the results
-            news_items = news_items[:limit]
+            async with get_http_session().get(self.BASE_URL, params=params) as response:
+                response.raise_for_status()
+                data = await response.json(content_type=None)
             
-            logger.info(f"Successfully processed {len(news_items)} news articles for {symbol}")
-            return news_items
+            return self._parse_news(symbol, data, limit)
             
-        except requests.exceptions.RequestException as e:
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
             logger.error(f"Network error fetching news for {symbol}: {str(e)}")
             return []
         except Exception as e:
             logger.error(f"Error fetching news for {symbol}: {str(e)}")
             return []
     
+    def _news_params(self, symbol: str, limit: int) -> Dict[str, Any]:
+        """Build NEWS_SENTIMENT query parameters.
+        
+        Args:
+            symbol: Stock ticker symbol
+            limit: Maximum number of news articles requested
+            
+        Returns:
+            Query parameters including the API key
+        """
+        return self._query_params(
+            "NEWS_SENTIMENT",
+            tickers=self._convert_symbol(symbol),
+            limit=min(limit, 50)  # Alpha Vantage max is 50
+        )
+    
+    def _parse_news(self, symbol: str, data: Dict[str, Any], limit: int) -> List[Dict[str, Any]]:
+        """Parse a NEWS_SENTIMENT response.
+        
+        Args:
+            symbol: Requested stock ticker symbol
+            data: Decoded JSON response
+            limit: Maximum number of news articles to return
+            
+        Returns:
+            List of news article dictionaries sorted by publish date (newest first)
+        """
+        # Check for API errors
+        if "Error Message" in data:
+            logger.error(f"Alpha Vantage error for {symbol}: {data['Error Message']}")
+            return []
+        
+        if "Note" in data:
+            logger.warning(f"Alpha Vantage rate limit for {symbol}: {data['Note']}")
+            return []
+        
+        if "feed" not in data or not data["feed"]:
+            logger.warning(f"No news found for symbol: {symbol}")
+            return []
+        
+        logger.info(f"Retrieved {len(data['feed'])} news items from Alpha Vantage for {symbol}")
+        
+        # Convert news data to structured format
+        news_items = []
+        for idx, item in enumerate(data["feed"]):
+            try:
+                title = item.get('title', '')
+                summary = item.get('summary', '')
+                source = item.get('source', 'Unknown')
+                url = item.get('url', '#')
+                banner_image = item.get('banner_image')
+                time_published = item.get('time_published', '')
+                
+                # Skip if title is missing
+                if not title:
+                    logger.warning(f"Skipping news item {idx}: missing title")
+                    continue
+                
+                # Parse timestamp: Alpha Vantage format "20250120T011450"
+                published_at = None
+                if time_published:
+                    try:
+                        published_at = datetime.strptime(time_published, "%Y%m%dT%H%M%S")
+                    except (ValueError, TypeError) as e:
+                        logger.warning(f"Failed to parse timestamp '{time_published}': {e}")
+                        published_at = datetime.now()
+                else:
+                    published_at = datetime.now()
+                
+                # Extract sentiment for the specific ticker
+                sentiment_score = None
+                sentiment_label = None
+                if 'ticker_sentiment' in item:
+                    for sentiment in item['ticker_sentiment']:
+                        if sentiment.get('ticker', '').upper() == symbol.upper():
+                            sentiment_score = sentiment.get('ticker_sentiment_score')
+                            sentiment_label = sentiment.get('ticker_sentiment_label')
+                            break
+                
+                news_item = {
+                    'title': title,
+                    'summary': summary if summary else '',
+                    'publisher': source,
+                    'link': url,
+                    'thumbnail_url': banner_image,
+                    'published_at': published_at,
+                    'sentiment_score': sentiment_score,
+                    'sentiment_label': sentiment_label,
+                }
+                news_items.append(news_item)
+                
+            except Exception as item_error:
+                logger.error(f"Failed to process news item {idx} for {symbol}: {item_error}")
+                continue
+        
+        # Sort by published_at in descending order (newest first)
+        news_items.sort(key=lambda x: x['published_at'], reverse=True)
+        
+        # Limit the results
+        news_items = news_items[:limit]
+        
+        logger.info(f"Successfully processed {len(news_items)} news articles for {symbol}")
+        return news_items
+    
     def get_company_overview(self, symbol: str) -> Optional[Dict[str, Any]]:
         """Fetch company overview including market cap from Alpha Vantage.
         
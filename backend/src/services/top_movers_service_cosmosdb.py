@@ -6,7 +6,7 @@ calling Alpha Vantage API. The data is updated hourly by Azure Functions.
 
 import logging
 from typing import Dict, Any, Optional
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from azure.cosmos import exceptions
 
 from src.core.database import get_top_movers_container
@@ -14,9 +14,29 @@ from src.core.database import get_top_movers_container
 logger = logging.getLogger(__name__)
 
 
+# Each date partition holds a single upserted document with this id
+LATEST_DOCUMENT_ID = "latest"
+
+
 class TopMoversService:
     """Service for fetching top movers data from Cosmos DB."""
     
+    @staticmethod
+    def _read_latest(container, date: str) -> Optional[Dict[str, Any]]:
+        """Point-read the latest top movers document for a date partition.
+        
+        Args:
+            container: Cosmos DB container for top movers
+            date: Date string in format 'YYYY-MM-DD'
+            
+        Returns:
+            The stored document, or None if the date has no data
+        """
+        try:
+            return container.read_item(item=LATEST_DOCUMENT_ID, partition_key=date)
+        except exceptions.CosmosResourceNotFoundError:
+            return None
+    
     def get_top_movers(self) -> Optional[Dict[str, Any]]:
         """Get the latest top movers data from Cosmos DB.
         
@@ -36,25 +56,17 @@ class TopMoversService:
         try:
             container = get_top_movers_container()
             
-            # Query to get the latest document
-            # Sort by timestamp descending and take the first one
-            query = """
-                SELECT TOP 1 *
-                FROM c
-                ORDER BY c.timestamp DESC
-            """
-            
-            items = list(container.query_items(
-                query=query,
-                enable_cross_partition_query=True
-            ))
+            # Point-read today's document; fall back to yesterday right after
+            # the UTC date rolls over and before the first hourly update lands
+            today = datetime.now(timezone.utc).date()
+            latest = self._read_latest(container, today.isoformat())
+            if latest is None:
+                latest = self._read_latest(container, (today - timedelta(days=1)).isoformat())
             
-            if not items:
+            if latest is None:
                 logger.warning("No top movers data found in Cosmos DB")
                 return None
             
-            latest = items[0]
-            
             # Extract data
             result = {
                 'metadata': 'Top gainers, losers, and most actively traded US stocks',
@@ -87,29 +99,12 @@ class TopMoversService:
         try:
             container = get_top_movers_container()
             
-            # Query by date partition
-            query = """
-                SELECT *
-                FROM c
-                WHERE c.date = @date
-                ORDER BY c.timestamp DESC
-            """
-            
-            parameters = [{"name": "@date", "value": date}]
+            latest = self._read_latest(container, date)
             
-            items = list(container.query_items(
-                query=query,
-                parameters=parameters,
-                partition_key=date
-            ))
-            
-            if not items:
+            if latest is None:
                 logger.warning(f"No top movers data found for date: {date}")
                 return None
             
-            # Get the latest entry for that date
-            latest = items[0]
-            
             result = {
                 'metadata': f'Top movers for {date}',
                 'last_updated': latest.get('timestamp', ''),
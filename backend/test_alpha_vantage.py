@@ -7,6 +7,7 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 # Import directly to avoid circular imports
+import asyncio
 import requests
 from datetime import datetime
 from enum import Enum
@@ -19,7 +20,7 @@ class Period(str, Enum):
     ONE_WEEK = "1wk"
     ONE_MONTH = "1mo"
 
-def test_alpha_vantage():
+async def test_alpha_vantage():
     """Test Alpha Vantage API integration."""
     
     service = AlphaVantageService()
@@ -30,7 +31,7 @@ def test_alpha_vantage():
     
     # Test 1: Get quote for IBM
     print("\n1. Testing Quote API for IBM...")
-    quote = service.get_quote('IBM')
+    quote = await service.get_quote_async('IBM')
     if quote:
         print(f"✅ Success!")
         print(f"   Symbol: {quote['symbol']}")
@@ -42,7 +43,7 @@ def test_alpha_vantage():
     
     # Test 2: Get quote for AAPL
     print("\n2. Testing Quote API for AAPL...")
-    quote = service.get_quote('AAPL')
+    quote = await service.get_quote_async('AAPL')
     if quote:
         print(f"✅ Success!")
         print(f"   Symbol: {quote['symbol']}")
@@ -76,7 +77,7 @@ def test_alpha_vantage():
     
     # Test 5: Get news
     print("\n5. Testing News API for AAPL...")
-    news = service.get_news('AAPL', limit=5)
+    news = await service.get_news_async('AAPL', limit=5)
     if news:
         print(f"✅ Success! Retrieved {len(news)} news articles:")
         for i, article in enumerate(news[:3], 1):
@@ -90,4 +91,4 @@ def test_alpha_vantage():
     print("=" * 60)
 
 if __name__ == '__main__':
-    test_alpha_vantage()
+    asyncio.run(test_alpha_vantage())
@@ -0,0 +1,65 @@
+"""Tests for the vectorized P&L calculation.
+
+Tests per-holding and total values, including holdings without a price.
+"""
+
+import numpy as np
+import pytest
+
+from src.core.pnl import compute_pnl
+
+
+class TestComputePnl:
+    """Tests for compute_pnl."""
+    
+    def test_priced_holdings(self):
+        """Test cost basis, value, P&L and return rate for priced holdings."""
+        cost_bases, current_values, profit_losses, return_rates, total_cost, total_value = compute_pnl(
+            np.array([10.0, 5.0]),
+            np.array([100.0, 200.0]),
+            np.array([150.0, 180.0])
+        )
+        
+        assert cost_bases.tolist() == [1000.0, 1000.0]
+        assert current_values.tolist() == [1500.0, 900.0]
+        assert profit_losses.tolist() == [500.0, -100.0]
+        assert return_rates.tolist() == pytest.approx([50.0, -10.0])
+        assert total_cost == 2000.0
+        assert total_value == 2400.0
+    
+    def test_zero_price_valued_at_cost(self):
+        """Test that a holding without a current price (0.0) has no P&L."""
+        cost_bases, current_values, profit_losses, return_rates, total_cost, total_value = compute_pnl(
+            np.array([10.0, 4.0]),
+            np.array([100.0, 50.0]),
+            np.array([0.0, 60.0])
+        )
+        
+        assert current_values.tolist() == [1000.0, 240.0]
+        assert profit_losses.tolist() == [0.0, 40.0]
+        assert return_rates.tolist() == pytest.approx([0.0, 20.0])
+        assert total_cost == 1200.0
+        assert total_value == 1240.0
+    
+    def test_zero_cost_basis_has_zero_return(self):
+        """Test that a zero cost basis yields a 0% return instead of inf/nan."""
+        _, _, profit_losses, return_rates, total_cost, _ = compute_pnl(
+            np.array([10.0]),
+            np.array([0.0]),
+            np.array([25.0])
+        )
+        
+        assert profit_losses.tolist() == [250.0]
+        assert return_rates.tolist() == [0.0]
+        assert total_cost == 0.0
+    
+    def test_no_holdings(self):
+        """Test that empty inputs give empty arrays and zero totals."""
+        empty = np.array([], dtype=float)
+        cost_bases, current_values, profit_losses, return_rates, total_cost, total_value = compute_pnl(
+            empty, empty, empty
+        )
+        
+        assert len(cost_bases) == len(current_values) == len(profit_losses) == len(return_rates) == 0
+        assert total_cost == 0.0
+        assert total_value == 0.0
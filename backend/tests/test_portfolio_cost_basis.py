@@ -0,0 +1,100 @@
+"""Tests for the portfolio cost basis endpoint.
+
+Tests GET /api/v1/portfolios/{portfolio_id}/cost-basis with a mocked
+async Cosmos DB container.
+"""
+
+from typing import Generator
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.main import app
+from src.api.portfolios import PORTFOLIO_COST_BASIS_QUERY, PORTFOLIO_QUERY
+from src.core.database import get_async_db
+from src.core.middleware import get_current_user_id
+
+
+USER_ID = "a" * 64
+PORTFOLIO_ID = "cab647a5-3d6c-418d-a4d9-214d064ef2a2"
+
+
+class MockAsyncContainer:
+    """Async container returning canned rows for the cost basis queries."""
+    
+    def __init__(self, portfolios: list, sums: list):
+        self.results = {PORTFOLIO_QUERY: portfolios, PORTFOLIO_COST_BASIS_QUERY: sums}
+        self.calls = []
+    
+    def query_items(self, query: str, parameters: list, partition_key: str):
+        self.calls.append((query, parameters, partition_key))
+        return self._iterate(self.results[query])
+    
+    async def _iterate(self, rows: list):
+        for row in rows:
+            yield row
+
+
+@pytest.fixture
+def api_client() -> Generator[TestClient, None, None]:
+    """Create a test client for the test user without running startup.
+    
+    Startup is skipped so no Cosmos DB connection is needed; each test
+    overrides get_async_db with its own MockAsyncContainer.
+    
+    Yields:
+        FastAPI test client
+    """
+    app.dependency_overrides[get_current_user_id] = lambda: USER_ID
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+class TestGetPortfolioCostBasis:
+    """Tests for GET /api/v1/portfolios/{portfolio_id}/cost-basis endpoint."""
+    
+    def test_cost_basis(self, api_client: TestClient):
+        """Test the summed cost basis and holdings count."""
+        container = MockAsyncContainer(
+            portfolios=[{"id": PORTFOLIO_ID, "name": "장기투자", "holdings_count": 2}],
+            sums=[2755.5]
+        )
+        app.dependency_overrides[get_async_db] = lambda: container
+        
+        response = api_client.get(f"/api/v1/portfolios/{PORTFOLIO_ID}/cost-basis")
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["portfolio_id"] == PORTFOLIO_ID
+        assert data["total_holdings"] == 2
+        assert float(data["total_cost_basis"]) == 2755.5
+        
+        # Both queries stay inside the user's partition
+        assert {call[0] for call in container.calls} == {PORTFOLIO_QUERY, PORTFOLIO_COST_BASIS_QUERY}
+        for _, parameters, partition_key in container.calls:
+            assert partition_key == USER_ID
+            assert {"name": "@portfolio_id", "value": PORTFOLIO_ID} in parameters
+    
+    def test_cost_basis_without_holdings(self, api_client: TestClient):
+        """Test that an empty SUM result reports zero."""
+        container = MockAsyncContainer(
+            portfolios=[{"id": PORTFOLIO_ID, "name": "정찰병", "holdings_count": None}],
+            sums=[]
+        )
+        app.dependency_overrides[get_async_db] = lambda: container
+        
+        response = api_client.get(f"/api/v1/portfolios/{PORTFOLIO_ID}/cost-basis")
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total_holdings"] == 0
+        assert float(data["total_cost_basis"]) == 0
+    
+    def test_cost_basis_portfolio_not_found(self, api_client: TestClient):
+        """Test 404 for a portfolio the user doesn't own."""
+        container = MockAsyncContainer(portfolios=[], sums=[])
+        app.dependency_overrides[get_async_db] = lambda: container
+        
+        response = api_client.get(f"/api/v1/portfolios/{PORTFOLIO_ID}/cost-basis")
+        
+        assert response.status_code == 404
@@ -0,0 +1,102 @@
+"""Tests for the in-process sliding-window rate limiter and client IP resolution."""
+
+from unittest.mock import patch
+
+from starlette.requests import Request
+
+from src.core.middleware import SlidingWindowRateLimiter, get_client_ip
+
+
+def make_request(peer: str, forwarded_for: str = None) -> Request:
+    """Build a bare request from a socket peer and optional X-Forwarded-For."""
+    headers = [(b"x-forwarded-for", forwarded_for.encode())] if forwarded_for else []
+    return Request({"type": "http", "headers": headers, "client": (peer, 443)})
+
+
+class TestSlidingWindowRateLimiter:
+    """Tests for SlidingWindowRateLimiter.hit."""
+    
+    @patch("src.core.middleware.time")
+    def test_blocks_after_max_requests(self, mock_time):
+        """Test that hits beyond max_requests within the period are rejected."""
+        mock_time.monotonic.return_value = 100.0
+        limiter = SlidingWindowRateLimiter(max_requests=3, period=60.0)
+        
+        assert [limiter.hit("1.2.3.4") for _ in range(4)] == [True, True, True, False]
+    
+    @patch("src.core.middleware.time")
+    def test_keys_are_independent(self, mock_time):
+        """Test that one key reaching its limit does not affect another."""
+        mock_time.monotonic.return_value = 100.0
+        limiter = SlidingWindowRateLimiter(max_requests=1, period=60.0)
+        
+        assert limiter.hit("a") is True
+        assert limiter.hit("a") is False
+        assert limiter.hit("b") is True
+    
+    @patch("src.core.middleware.time")
+    def test_window_slides(self, mock_time):
+        """Test that hits older than the period stop counting."""
+        limiter = SlidingWindowRateLimiter(max_requests=2, period=60.0)
+        
+        mock_time.monotonic.return_value = 100.0
+        assert limiter.hit("a") is True
+        mock_time.monotonic.return_value = 130.0
+        assert limiter.hit("a") is True
+        assert limiter.hit("a") is False
+        
+        # The first hit expires exactly one period later; the second still counts
+        mock_time.monotonic.return_value = 160.0
+        assert limiter.hit("a") is True
+        assert limiter.hit("a") is False
+    
+    @patch("src.core.middleware.time")
+    def test_rejected_hits_are_not_recorded(self, mock_time):
+        """Test that rejected requests don't extend the window."""
+        limiter = SlidingWindowRateLimiter(max_requests=1, period=60.0)
+        
+        mock_time.monotonic.return_value = 100.0
+        assert limiter.hit("a") is True
+        mock_time.monotonic.return_value = 150.0
+        assert limiter.hit("a") is False
+        mock_time.monotonic.return_value = 160.0
+        assert limiter.hit("a") is True
+    
+    @patch("src.core.middleware.time")
+    def test_key_table_is_bounded(self, mock_time):
+        """Test that tracked keys are reset once max_keys is reached."""
+        mock_time.monotonic.return_value = 100.0
+        limiter = SlidingWindowRateLimiter(max_requests=1, period=60.0, max_keys=2)
+        
+        limiter.hit("a")
+        limiter.hit("b")
+        limiter.hit("c")
+        
+        assert set(limiter._hits) == {"c"}
+        assert limiter.hit("a") is True
+
+
+class TestGetClientIp:
+    """Tests for get_client_ip."""
+    
+    @patch("src.core.middleware.settings.TRUSTED_PROXY_IPS", [])
+    def test_header_ignored_without_trusted_proxies(self):
+        """Test that a direct client can't pick its address via the header."""
+        assert get_client_ip(make_request("198.51.100.7", "203.0.113.1")) == "198.51.100.7"
+    
+    @patch("src.core.middleware.settings.TRUSTED_PROXY_IPS", ["10.0.0.1"])
+    def test_header_ignored_from_untrusted_peer(self):
+        """Test that the header is only read from a configured proxy."""
+        assert get_client_ip(make_request("198.51.100.7", "203.0.113.1")) == "198.51.100.7"
+    
+    @patch("src.core.middleware.settings.TRUSTED_PROXY_IPS", ["10.0.0.1", "10.0.0.2"])
+    def test_skips_trusted_hops(self):
+        """Test that the rightmost untrusted entry is used, ignoring spoofed ones."""
+        request = make_request("10.0.0.1", "1.1.1.1, 203.0.113.1, 10.0.0.2")
+        assert get_client_ip(request) == "203.0.113.1"
+    
+    @patch("src.core.middleware.settings.TRUSTED_PROXY_IPS", ["*"])
+    def test_any_peer_uses_rightmost_entry(self):
+        """Test that with * the entry added by the proxy is used, without its port."""
+        request = make_request("169.254.129.3", "1.1.1.1, 203.0.113.1:54321")
+        assert get_client_ip(request) == "203.0.113.1"
@@ -0,0 +1,99 @@
+"""Tests for request coalescing of concurrent upstream calls."""
+
+import asyncio
+
+import pytest
+
+from src.core.single_flight import SingleFlight
+
+
+class TestSingleFlight:
+    """Tests for SingleFlight.run."""
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_task(self):
+        """Test that concurrent calls for the same key run func once."""
+        single_flight = SingleFlight()
+        release = asyncio.Event()
+        calls = []
+        
+        async def fetch():
+            calls.append(1)
+            await release.wait()
+            return "quote"
+        
+        waiters = [asyncio.ensure_future(single_flight.run("AAPL", fetch)) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+        
+        assert await asyncio.gather(*waiters) == ["quote", "quote", "quote"]
+        assert len(calls) == 1
+    
+    @pytest.mark.asyncio
+    async def test_different_keys_run_separately(self):
+        """Test that calls for different keys are not coalesced."""
+        single_flight = SingleFlight()
+        
+        async def fetch(symbol):
+            await asyncio.sleep(0)
+            return symbol
+        
+        results = await asyncio.gather(
+            single_flight.run("AAPL", lambda: fetch("AAPL")),
+            single_flight.run("MSFT", lambda: fetch("MSFT")),
+        )
+        
+        assert results == ["AAPL", "MSFT"]
+    
+    @pytest.mark.asyncio
+    async def test_key_released_after_completion(self):
+        """Test that results are not cached once the task finishes."""
+        single_flight = SingleFlight()
+        calls = []
+        
+        async def fetch():
+            calls.append(1)
+            return len(calls)
+        
+        assert await single_flight.run("AAPL", fetch) == 1
+        assert await single_flight.run("AAPL", fetch) == 2
+        assert single_flight._inflight == {}
+    
+    @pytest.mark.asyncio
+    async def test_exception_shared_and_released(self):
+        """Test that a failure reaches every waiter and frees the key."""
+        single_flight = SingleFlight()
+        release = asyncio.Event()
+        
+        async def fetch():
+            await release.wait()
+            raise RuntimeError("upstream down")
+        
+        waiters = [asyncio.ensure_future(single_flight.run("AAPL", fetch)) for _ in range(2)]
+        await asyncio.sleep(0)
+        release.set()
+        
+        results = await asyncio.gather(*waiters, return_exceptions=True)
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert single_flight._inflight == {}
+    
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_others(self):
+        """Test that cancelling one waiter leaves the shared task running."""
+        single_flight = SingleFlight()
+        release = asyncio.Event()
+        
+        async def fetch():
+            await release.wait()
+            return "quote"
+        
+        first = asyncio.ensure_future(single_flight.run("AAPL", fetch))
+        second = asyncio.ensure_future(single_flight.run("AAPL", fetch))
+        await asyncio.sleep(0)
+        
+        first.cancel()
+        release.set()
+        
+        assert await second == "quote"
+        with pytest.raises(asyncio.CancelledError):
+            await first